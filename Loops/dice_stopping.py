@@ -0,0 +1,298 @@
+# ===================================================================
+# Dice Stopping Games - Exact Answers Instead of Simulation
+# ===================================================================
+#
+# Companion code for 03_snake_eyes.py.
+#
+# 03_snake_eyes.py answers "how long until snake eyes?" one run at a
+# time. Averaging millions of runs gets close to the answer; this file
+# computes it EXACTLY, as a fraction, in microseconds:
+#
+#   solve(2)                  snake eyes: expected 36 rolls
+#   solve(7)                  any total, with any number of dice/sides
+#   solve({2, 12})            one of several totals
+#   solve('doubles')          every die shows the same face
+#   solve((7, 7))             a SEQUENCE of totals, in a row
+#
+# STEP 1 - THE DISTRIBUTION OF THE TOTAL (convolution):
+# One die is 1 way each to roll 1..6. Adding a die shifts and adds
+# those counts ("convolution"):
+#   1 die:  1 1 1 1 1 1            (totals 1..6)
+#   2 dice: 1 2 3 4 5 6 5 4 3 2 1  (totals 2..12, out of 36)
+# so P(total == 2) = 1/36, P(total == 7) = 6/36.
+#
+# STEP 2 - ONE-ROLL TARGETS ARE GEOMETRIC:
+# If one roll succeeds with probability p, the number of rolls N has
+#   E[N] = 1/p      Var[N] = (1 - p) / p²      P(N > k) = (1 - p)^k
+# Snake eyes: p = 1/36, so 36 rolls on average.
+#
+# STEP 3 - SEQUENCES ARE AN ABSORBING MARKOV CHAIN:
+# For (6, 8) the state is "how much of the sequence the last rolls
+# already match": 0 -> rolled 6 -> rolled 6, 8 = done. A roll moves
+# between states (a 6 after a 6 keeps you at "rolled 6"), and
+#   expected rolls t:   (I - Q) t = 1
+#   second moment s:    (I - Q) s = 1 + 2 Q t
+# where Q holds the probabilities between unfinished states. Both are
+# solved exactly with Fractions.
+#
+# Compiled chains are cached per (target, dice, sides), so asking
+# again costs a dictionary lookup.
+#
+# ===================================================================
+
+import random
+import time
+from fractions import Fraction
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def sum_distribution(dice=2, sides=6):
+    """{total: probability} for the sum of `dice` fair dice."""
+    if dice < 1 or sides < 2:
+        raise ValueError('need at least one die with at least two sides')
+    # ways[t] = number of ways to roll a total of t with the dice so far
+    ways = [0] + [1] * sides
+    for _ in range(dice - 1):
+        rolled = [0] * (len(ways) + sides)
+        for total, count in enumerate(ways):
+            if count:
+                for face in range(1, sides + 1):
+                    rolled[total + face] += count
+        ways = rolled
+    outcomes = sides ** dice
+    return {total: Fraction(count, outcomes)
+            for total, count in enumerate(ways) if count}
+
+
+class StoppingChain:
+    """Roll until the target happens: an absorbing Markov chain, solved exactly."""
+
+    __slots__ = ('target', 'dice', 'sides', 'transitions', 'expected', 'variance')
+
+    def __init__(self, target, dice, sides, transitions):
+        self.target = target
+        self.dice = dice
+        self.sides = sides
+        # transitions[i] = {j: P(i -> j)} between unfinished states;
+        # whatever is missing from a row is the chance of finishing
+        self.transitions = transitions
+        times = _solve(_identity_minus(transitions), [Fraction(1)] * len(transitions))
+        again = [1 + 2 * sum(p * times[j] for j, p in row.items()) for row in transitions]
+        second = _solve(_identity_minus(transitions), again)
+        self.expected = times[0]
+        self.variance = second[0] - times[0] ** 2
+
+    @property
+    def states(self):
+        return len(self.transitions)
+
+    def tail(self, rolls):
+        """P(more than `rolls` rolls are needed)."""
+        state = {0: Fraction(1)}
+        for _ in range(rolls):
+            moved = {}
+            for i, p in state.items():
+                for j, q in self.transitions[i].items():
+                    moved[j] = moved.get(j, 0) + p * q
+            state = moved
+        return sum(state.values(), Fraction(0))
+
+    def probability_of(self, rolls):
+        """P(exactly `rolls` rolls are needed)."""
+        if rolls < 1:
+            return Fraction(0)
+        return self.tail(rolls - 1) - self.tail(rolls)
+
+    def rolls_for(self, confidence):
+        """Fewest rolls that finish with at least this probability."""
+        if not 0 <= confidence < 1:
+            raise ValueError('confidence must be in [0, 1)')
+        # Floats are plenty to find k; exact Fractions grow every roll
+        transitions = [{j: float(q) for j, q in row.items()} for row in self.transitions]
+        rolls = 0
+        state = {0: 1.0}
+        while sum(state.values()) > 1 - confidence:
+            moved = {}
+            for i, p in state.items():
+                for j, q in transitions[i].items():
+                    moved[j] = moved.get(j, 0.0) + p * q
+            state = moved
+            rolls += 1
+        return rolls
+
+    def __repr__(self):
+        return (f'StoppingChain({self.target!r}, dice={self.dice}, sides={self.sides}, '
+                f'states={self.states}, expected={self.expected})')
+
+
+def _identity_minus(transitions):
+    size = len(transitions)
+    matrix = [[Fraction(int(i == j)) for j in range(size)] for i in range(size)]
+    for i, row in enumerate(transitions):
+        for j, p in row.items():
+            matrix[i][j] -= p
+    return matrix
+
+
+def _solve(matrix, right):
+    """Gauss-Jordan elimination over Fractions: matrix x = right."""
+    size = len(matrix)
+    rows = [row[:] + [value] for row, value in zip(matrix, right)]
+    for column in range(size):
+        pivot = next(r for r in range(column, size) if rows[r][column] != 0)
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        lead = rows[column][column]
+        rows[column] = [value / lead for value in rows[column]]
+        for r in range(size):
+            factor = rows[r][column]
+            if r != column and factor:
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[column])]
+    return [row[-1] for row in rows]
+
+
+def _normalize(target):
+    if target == 'doubles':
+        return target
+    if isinstance(target, int):
+        return frozenset([target])
+    if isinstance(target, (set, frozenset)):
+        return frozenset(target)
+    if isinstance(target, (tuple, list)):
+        if len(target) == 0:
+            raise ValueError('a sequence target needs at least one total')
+        return tuple(target)
+    raise TypeError(f'unsupported target: {target!r}')
+
+
+def _one_roll(probability):
+    if probability == 0:
+        raise ValueError('the target can never be reached')
+    # Single unfinished state: stay with 1 - p, finish with p
+    return [{0: 1 - probability}] if probability != 1 else [{}]
+
+
+def _sequence_transitions(sequence, distribution):
+    transitions = []
+    for matched in range(len(sequence)):
+        row = {}
+        for total in set(sequence):
+            # Longest prefix of the sequence that the rolls now end with
+            rolled = sequence[:matched] + (total,)
+            state = next(length for length in range(len(rolled), -1, -1)
+                         if rolled[len(rolled) - length:] == sequence[:length])
+            if state < len(sequence):
+                row[state] = row.get(state, 0) + distribution.get(total, 0)
+        # Any other total matches nothing: back to the start
+        row[0] = row.get(0, 0) + 1 - sum(distribution.get(t, 0) for t in set(sequence))
+        transitions.append({j: p for j, p in row.items() if p})
+    return transitions
+
+
+@lru_cache(maxsize=None)
+def _compile(target, dice, sides):
+    distribution = sum_distribution(dice, sides)
+    if target == 'doubles':
+        transitions = _one_roll(Fraction(sides, sides ** dice))
+    elif isinstance(target, frozenset):
+        transitions = _one_roll(sum(distribution.get(t, 0) for t in target))
+    else:
+        if any(t not in distribution for t in target):
+            raise ValueError('the target can never be reached')
+        transitions = _sequence_transitions(target, distribution)
+    return StoppingChain(target, dice, sides, transitions)
+
+
+def solve(target=2, dice=2, sides=6):
+    """The StoppingChain for rolling until target (cached)."""
+    return _compile(_normalize(target), dice, sides)
+
+
+def simulate(target=2, dice=2, sides=6, games=100_000, rng=random):
+    """Average rolls over `games` simulated games (what 03_snake_eyes.py does)."""
+    target = _normalize(target)
+    length = len(target) if isinstance(target, tuple) else 1
+    total_rolls = 0
+    for _ in range(games):
+        recent = []
+        while True:
+            faces = [rng.randint(1, sides) for _ in range(dice)]
+            total_rolls += 1
+            if target == 'doubles':
+                if len(set(faces)) == 1:
+                    break
+                continue
+            if isinstance(target, frozenset):
+                if sum(faces) in target:
+                    break
+                continue
+            recent.append(sum(faces))
+            if tuple(recent[-length:]) == target:
+                break
+    return total_rolls / games
+
+
+def benchmark(games=10_000):
+    """Exact solve (cold and cached) against simulating `games` games."""
+    targets = [2, 'doubles', (7, 7), (6, 8, 6)]
+    print(f'{"target":<12} {"exact E[rolls]":>16} {"simulated":>10} '
+          f'{"solve µs":>9} {"cached µs":>10} {"simulate ms":>12}')
+    for target in targets:
+        _compile.cache_clear()
+        begin = time.perf_counter()
+        chain = solve(target)
+        cold = time.perf_counter() - begin
+        begin = time.perf_counter()
+        for _ in range(1000):
+            solve(target)
+        cached = (time.perf_counter() - begin) / 1000
+        begin = time.perf_counter()
+        average = simulate(target, games=games, rng=random.Random(1))
+        simulated = time.perf_counter() - begin
+        print(f'{target!s:<12} {str(chain.expected):>16} {average:>10.2f} '
+              f'{cold * 1e6:>9.0f} {cached * 1e6:>10.2f} {simulated * 1e3:>12.0f}')
+
+
+if __name__ == '__main__':
+    # Convolution: the two-dice triangle, and three dice
+    two = sum_distribution()
+    assert [two[t] * 36 for t in range(2, 13)] == [1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]
+    assert sum_distribution(3)[10] == Fraction(27, 216)
+    assert sum(sum_distribution(4, 8).values()) == 1
+
+    # Snake eyes: geometric with p = 1/36
+    snake = solve(2)
+    assert snake.expected == 36 and snake.variance == 35 * 36
+    assert snake.tail(10) == Fraction(35, 36) ** 10
+    assert snake.probability_of(1) == Fraction(1, 36)
+    assert snake.rolls_for(0.5) == 25  # (35/36)^25 < 0.5 < (35/36)^24
+
+    assert solve('doubles').expected == 6
+    assert solve({2, 12}).expected == 18
+    assert solve(3, dice=1).expected == 6
+    assert solve('doubles', dice=3).expected == 36
+
+    # Two sevens in a row: 1/p + 1/p² with p = 1/6
+    sevens = solve((7, 7))
+    assert sevens.expected == 42 and sevens.states == 2
+    assert sevens.tail(1) == 1 and sevens.probability_of(2) == Fraction(1, 36)
+    # A one-total sequence is the same game as that total
+    assert solve((2,)).expected == 36 and solve((2,)).variance == snake.variance
+
+    # Cached: the same chain object comes back
+    assert solve((7, 7)) is sevens and solve([7, 7]) is sevens
+
+    # Exact answers agree with simulation
+    for target in (7, 'doubles', (6, 8)):
+        exact = float(solve(target).expected)
+        assert abs(simulate(target, games=20_000, rng=random.Random(7)) - exact) < 0.05 * exact
+
+    for bad in (13, (7, 1)):
+        try:
+            solve(bad)
+            assert False, 'Should raise error'
+        except ValueError:
+            pass
+
+    print('All dice stopping tests passed!')
+    benchmark()
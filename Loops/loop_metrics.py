@@ -0,0 +1,447 @@
+# ===================================================================
+# Loop Metrics - Opt-In Counters, Sampled Timers and Histograms
+# ===================================================================
+#
+# Companion code for 01_are_we_there_yet.py, 03_snake_eyes.py and
+# 05_sum_of_squares.py (and the interview_source/ functions).
+#
+# The challenge loops can't tell you how many times they ran or where
+# the time went. This file adds a small metrics layer that can wrap
+# any loop or function:
+#
+#   for i in metrics.loop(range(1, number + 1), 'sum_of_squares'):
+#       total = total + i**2
+#
+#   for _ in metrics.while_loop(lambda: total != 2, 'snake_eyes'):
+#       ...                       # same as: while total != 2:
+#
+#   get_max_profit = metrics.timed('get_max_profit')(get_max_profit)
+#
+# DISABLED (the default) COSTS NEARLY NOTHING:
+# The enabled flag is checked ONCE - when the loop starts, or when a
+# function is wrapped - never per iteration. A disabled loop() hands
+# back the original iterable, so the loop runs at full speed, and a
+# disabled timed() returns the function itself.
+#
+# ENABLED, each loop records:
+#   <name>_iterations_total       counter: how many iterations ran
+#   <name>_seconds_total          counter: wall time inside the loop
+#   <name>_iteration_seconds      histogram: every Nth iteration timed
+#                                 (sample_every, default 64), so even
+#                                 the timer costs only 1/N of the loop
+# and each timed() function records <name>_calls_total and a
+# <name>_call_seconds histogram of every call.
+#
+# EXPORT: JSON, or Prometheus text format (for node_exporter's textfile
+# collector). Set LOOP_METRICS=/path/metrics.prom (or .json) and the
+# module-level METRICS registry is enabled and written when the
+# program exits:
+#
+#   LOOP_METRICS=metrics.json python loop_metrics.py
+#
+# ===================================================================
+
+import atexit
+import functools
+import importlib.util
+import json
+import os
+import random
+import re
+import time
+from bisect import bisect_left
+
+# 100 ns .. 10 s, three buckets per decade
+DEFAULT_BUCKETS = tuple(float(f'{mantissa}e{exponent}')
+                        for exponent in range(-7, 1)
+                        for mantissa in (1, 2.5, 5)) + (10.0,)
+
+_NAME = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*$')
+_SOURCE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            os.pardir, 'interview_source')
+
+
+class Counter:
+    """A value that only goes up."""
+
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Histogram:
+    """Counts of observations per bucket, plus their sum and count."""
+
+    __slots__ = ('name', 'help', 'buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, name, help='', buckets=DEFAULT_BUCKETS):
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError('buckets must be strictly increasing')
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # One count per bucket, plus the +Inf bucket at the end
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+def _while_true(condition):
+    # Not iter(condition, False): that only stops on a value == False,
+    # so a condition returning [] or None would keep looping
+    while condition():
+        yield None
+
+
+class Metrics:
+    """A registry of counters and histograms; a no-op unless enabled."""
+
+    def __init__(self, enabled=False, sample_every=64, buckets=DEFAULT_BUCKETS):
+        if sample_every < 1:
+            raise ValueError('sample_every must be at least 1')
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.buckets = buckets
+        self._metrics = {}
+
+    @classmethod
+    def from_environment(cls, variable='LOOP_METRICS'):
+        """Enabled, and exported at exit, when the variable names a file."""
+        path = os.environ.get(variable)
+        sample_every = int(os.environ.get(variable + '_SAMPLE', 64))
+        metrics = cls(enabled=bool(path), sample_every=sample_every)
+        if path:
+            atexit.register(metrics.export, path)
+        return metrics
+
+    def _get(self, kind, name, help, *args):
+        if not _NAME.match(name):
+            raise ValueError(f'invalid metric name: {name!r}')
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = kind(name, help, *args)
+        elif not isinstance(metric, kind):
+            raise ValueError(f'{name} is already a {type(metric).__name__}')
+        return metric
+
+    def counter(self, name, help=''):
+        return self._get(Counter, name, help)
+
+    def histogram(self, name, help='', buckets=None):
+        return self._get(Histogram, name, help, buckets or self.buckets)
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    # ---------------------------------------------------------------
+    # Wrapping loops and functions
+    # ---------------------------------------------------------------
+
+    def loop(self, iterable, name):
+        """Iterate over iterable, recording iterations and sampled timings."""
+        if not self.enabled:
+            return iterable
+        return self._instrumented(iter(iterable), name)
+
+    def while_loop(self, condition, name):
+        """for _ in while_loop(cond, name): is `while cond():`, instrumented."""
+        return self.loop(_while_true(condition), name)
+
+    def _instrumented(self, iterator, name):
+        iterations = self.counter(name + '_iterations_total', 'Loop iterations')
+        seconds = self.counter(name + '_seconds_total', 'Time spent in the loop')
+        timings = self.histogram(name + '_iteration_seconds',
+                                 f'Time per iteration, 1 in {self.sample_every} sampled')
+        every = self.sample_every
+        clock = time.perf_counter
+        count = 0
+        started = clock()
+        try:
+            for item in iterator:
+                if count % every:
+                    count += 1
+                    yield item
+                    continue
+                count += 1
+                # Sampled: time the loop body, from handing out the item
+                # until the loop asks for the next one
+                begin = clock()
+                yield item
+                timings.observe(clock() - begin)
+        finally:
+            # Also runs when the loop body breaks out early
+            iterations.inc(count)
+            seconds.inc(clock() - started)
+
+    def timed(self, name):
+        """Decorator counting and timing every call. Identity when disabled."""
+        def decorate(func):
+            if not self.enabled:
+                return func
+            calls = self.counter(name + '_calls_total', f'Calls to {func.__name__}')
+            timings = self.histogram(name + '_call_seconds', f'Time per call to {func.__name__}')
+            clock = time.perf_counter
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                begin = clock()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    timings.observe(clock() - begin)
+                    calls.inc()
+            return wrapper
+        return decorate
+
+    # ---------------------------------------------------------------
+    # Export
+    # ---------------------------------------------------------------
+
+    def to_json(self):
+        counters = {}
+        histograms = {}
+        for name, metric in sorted(self._metrics.items()):
+            if isinstance(metric, Counter):
+                counters[name] = metric.value
+            else:
+                histograms[name] = {
+                    'buckets': [['+Inf' if bound == float('inf') else bound, count]
+                                for bound, count in metric.cumulative()],
+                    'sum': metric.sum,
+                    'count': metric.count,
+                }
+        return json.dumps({'timestamp': time.time(), 'counters': counters,
+                           'histograms': histograms}, indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            if metric.help:
+                lines.append(f'# HELP {name} {metric.help}')
+            if isinstance(metric, Counter):
+                lines.append(f'# TYPE {name} counter')
+                lines.append(f'{name} {metric.value}')
+                continue
+            lines.append(f'# TYPE {name} histogram')
+            for bound, count in metric.cumulative():
+                label = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{le="{label}"}} {count}')
+            lines.append(f'{name}_sum {metric.sum!r}')
+            lines.append(f'{name}_count {metric.count}')
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path, format=None):
+        """Write JSON (.json) or Prometheus text (anything else) atomically."""
+        if format is None:
+            format = 'json' if path.endswith('.json') else 'prometheus'
+        if format not in ('json', 'prometheus'):
+            raise ValueError(f'unknown format: {format!r}')
+        text = self.to_json() if format == 'json' else self.to_prometheus()
+        # Write then rename, so a scraper never reads half a file
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temporary, path)
+
+
+METRICS = Metrics.from_environment()
+
+
+# -------------------------------------------------------------------
+# The challenge loops, instrumented
+# -------------------------------------------------------------------
+
+def are_we_there_yet(ask=input, metrics=None):
+    """01_are_we_there_yet.py; returns how many times it asked."""
+    metrics = metrics or METRICS
+    asked = 0
+    answer = ''
+    for _ in metrics.while_loop(lambda: answer != 'Yes', 'are_we_there_yet'):
+        answer = ask("Are we there yet? ")
+        asked += 1
+    return asked
+
+
+def snake_eyes(rng=random, say=print, metrics=None):
+    """03_snake_eyes.py; returns how many times the dice were rolled."""
+    metrics = metrics or METRICS
+    die1 = rng.randint(1, 6)
+    die2 = rng.randint(1, 6)
+    total = die1 + die2
+    rolls = 1
+    for _ in metrics.while_loop(lambda: total != 2, 'snake_eyes'):
+        say("Nope")
+        die1 = rng.randint(1, 6)
+        die2 = rng.randint(1, 6)
+        total = die1 + die2
+        rolls += 1
+    say("Snake eyes!")
+    return rolls
+
+
+def sum_of_squares(number, metrics=None):
+    """05_sum_of_squares.py without the input() and print()."""
+    metrics = metrics or METRICS
+    total = 0
+    for i in metrics.loop(range(1, number + 1), 'sum_of_squares'):
+        total = total + i**2
+    return total
+
+
+def load_function(relative_path, name):
+    """Load one function from ../interview_source/ by file path.
+
+    big_o_harness.py has the same loader, but it lives under
+    interview_source/ itself, so reaching it from Loops/ would take this
+    much importlib anyway. Folder names there have spaces, so neither
+    can be a plain import.
+    """
+    path = os.path.join(_SOURCE_ROOT, relative_path)
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def instrument_interview_functions(metrics=None):
+    """Timed versions of a few interview_source/ reference solutions."""
+    metrics = metrics or METRICS
+    functions = {
+        'get_max_profit': ('3. Greedy algorithms/practice/apple_stocks_streaming.py',
+                           'get_max_profit'),
+        'highest_product_of_3': ('3. Greedy algorithms/practice/highest_product_of_k.py',
+                                 'highest_product_of_3'),
+        'reverse_words': ('Practice/reverse_words_buffers.py', 'reverse_words'),
+    }
+    return {name: metrics.timed(name)(load_function(path, function))
+            for name, (path, function) in functions.items()}
+
+
+def benchmark(n=1_000_000):
+    """ns/iteration of sum_of_squares: plain loop, disabled and enabled metrics."""
+    def plain():
+        total = 0
+        for i in range(1, n + 1):
+            total = total + i**2
+        return total
+
+    runs = [
+        ('plain for loop', plain),
+        ('metrics disabled', lambda: sum_of_squares(n, Metrics())),
+        ('metrics enabled', lambda: sum_of_squares(n, Metrics(enabled=True))),
+        ('enabled, every iteration timed',
+         lambda: sum_of_squares(n, Metrics(enabled=True, sample_every=1))),
+    ]
+    print(f'sum_of_squares({n:,})')
+    for name, run in runs:
+        best = float('inf')
+        for _ in range(3):
+            begin = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - begin)
+        print(f'  {name:<32} {best / n * 1e9:>7.1f} ns/iteration')
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    # Disabled: the loop gets the original iterable, functions are unwrapped
+    disabled = Metrics()
+    numbers = range(5)
+    assert disabled.loop(numbers, 'x') is numbers
+    assert disabled.timed('f')(len) is len
+    assert sum_of_squares(5, disabled) == 55 and not list(disabled._metrics)
+
+    # Enabled: iterations counted, 1 in sample_every timed
+    metrics = Metrics(enabled=True, sample_every=4)
+    assert sum_of_squares(10, metrics) == 385
+    assert metrics['sum_of_squares_iterations_total'].value == 10
+    assert metrics['sum_of_squares_iteration_seconds'].count == 3  # 0, 4, 8
+    assert metrics['sum_of_squares_seconds_total'].value > 0
+
+    answers = iter(['One more hour', 'Almost there', "Don't make me pull over", 'Yes'])
+    assert are_we_there_yet(lambda prompt: next(answers), metrics) == 4
+    assert metrics['are_we_there_yet_iterations_total'].value == 4
+
+    said = []
+    rolls = snake_eyes(random.Random(3), said.append, metrics)
+    assert said[-1] == 'Snake eyes!' and len(said) == rolls
+    assert metrics['snake_eyes_iterations_total'].value == rolls - 1
+
+    # while_loop stops on any falsy condition, enabled or not
+    for registry in (disabled, metrics):
+        items = [1, 2, 3]
+        for _ in registry.while_loop(lambda: items, 'drain'):
+            items.pop()
+        assert items == []
+    assert metrics['drain_iterations_total'].value == 3
+
+    # Breaking out of a loop early still records what ran
+    for i in metrics.loop(range(100), 'early'):
+        if i == 6:
+            break
+    assert metrics['early_iterations_total'].value == 7
+
+    # Histogram buckets are cumulative
+    histogram = Histogram('h', buckets=(1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 9):
+        histogram.observe(value)
+    assert histogram.cumulative() == [(1, 2), (2, 3), (5, 4), (float('inf'), 5)]
+
+    # Interview functions, timed
+    functions = instrument_interview_functions(metrics)
+    assert functions['get_max_profit']([10, 7, 5, 8, 11, 9]) == 6
+    assert functions['highest_product_of_3']([-10, -10, 1, 3, 2]) == 300
+    assert metrics['get_max_profit_calls_total'].value == 1
+
+    for bad in ('9lives', 'has-dash'):
+        try:
+            metrics.counter(bad)
+            assert False, 'Should raise error'
+        except ValueError:
+            pass
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'metrics.json')
+        metrics.export(path)
+        with open(path) as file:
+            exported = json.load(file)
+        assert exported['counters']['sum_of_squares_iterations_total'] == 10
+        assert exported['histograms']['get_max_profit_call_seconds']['count'] == 1
+
+        path = os.path.join(directory, 'metrics.prom')
+        metrics.export(path)
+        with open(path) as file:
+            text = file.read()
+        assert '# TYPE sum_of_squares_iterations_total counter\n' \
+               'sum_of_squares_iterations_total 10\n' in text
+        assert 'sum_of_squares_iteration_seconds_bucket{le="+Inf"} 3\n' in text
+        assert sorted(os.listdir(directory)) == ['metrics.json', 'metrics.prom']
+
+    print('All loop metrics tests passed!')
+    sum_of_squares(100_000)  # recorded in METRICS when LOOP_METRICS is set
+    benchmark()
@@ -0,0 +1,470 @@
+# ===================================================================
+# Big O Notation - Measuring It: An Empirical Complexity Harness
+# ===================================================================
+#
+# Companion code for big_o_notation.md and logarithms.md.
+#
+# The readings DERIVE complexities: binary search is O(log n), merge
+# sort is O(n log n), the slicing cafe checker is O(n²). This file
+# MEASURES them, so a claim in a write-up (or a slowdown in a commit)
+# can be checked against the clock:
+#
+# 1. measure() - run a function on generated inputs at geometrically
+#    growing sizes (n, 2n, 4n, ...). Each size gets a warmup call,
+#    enough calls per timing to be above timer noise, and several
+#    repetitions; the fastest repetition is kept (like timeit).
+# 2. fit_complexity() - fit the timings against each growth model
+#       O(1), O(log n), O(n), O(n log n), O(n²)
+#    and pick the one that explains them best.
+# 3. check_regression() - remember the fitted class per function and
+#    commit in a JSON file, and flag a function whose class got WORSE
+#    since the last commit whose fit was confident.
+#
+# ===================================================================
+# FITTING
+# ===================================================================
+#
+# For every model f(n) we fit   time ≈ a + b * f(n)   with a, b >= 0.
+# "a" soaks up the fixed per-call overhead ("drop the constants"), so
+# small inputs don't drag the fit towards O(1).
+#
+# Timings span several orders of magnitude, so the fit minimizes the
+# RELATIVE error (a 1 ms miss matters at 2 ms, not at 2 s).
+#
+# PARSIMONY: every growing model contains the O(1) fit (b = 0), so on
+# noisy flat timings a bigger model ALWAYS fits a little better - it
+# bends to follow the noise. Smallest error alone would report O(n²)
+# for a dict lookup. So a growing model is only a candidate when
+#   - its b * f(n) term explains a real share of the time across the
+#     size range (MIN_GROWTH_SHARE of the time at the largest n), and
+#   - the log-log slope agrees: a flat slope (below FLAT_SLOPE) can't
+#     be any growing class, and the measured slope must be at least
+#     half the slope of the fitted curve itself, and
+# among the candidates the SIMPLEST one wins unless a bigger one cuts
+# the error by a clear margin (error <= simpler * (1 - MARGIN), and by
+# more than NOISE_FLOOR).
+#
+# CONFIDENCE compares the best model to the runner-up:
+#
+#   confidence = 1 - best_error / runner_up_error
+#
+# Near 0: two models explain the data about equally well (O(n) and
+# O(n log n) often do over a small size range - log n barely moves).
+# Near 1: the runner-up is far worse. It's a separation score, not a
+# statistical probability. When parsimony keeps a simpler model that
+# fits slightly worse than a bigger one, confidence is 0.
+#
+# We also report the log-log SLOPE: how fast time grows when n
+# doubles. About 0 for O(1), 1 for O(n), 2 for O(n²).
+#
+# ===================================================================
+
+import argparse
+import gc
+import importlib.util
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+MODELS = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log2(n)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log2(n)),
+    ('O(n²)', lambda n: float(n) * n),
+]
+_RANK = {name: rank for rank, (name, _) in enumerate(MODELS)}
+
+# A bigger model must beat a simpler one by this much relative error...
+MARGIN = 0.25
+# ...and by this much absolutely (half a percent of RMS relative error)
+NOISE_FLOOR = 0.005
+# Share of the time at the largest size the growth term must explain
+MIN_GROWTH_SHARE = 0.1
+# Below this log-log slope the timings are flat: no growing class
+FLAT_SLOPE = 0.02
+
+Fit = namedtuple('Fit', ['model', 'intercept', 'coefficient', 'error'])
+ComplexityReport = namedtuple(
+    'ComplexityReport',
+    ['name', 'sizes', 'times', 'best', 'runner_up', 'confidence', 'slope'])
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SOURCE_ROOT = os.path.dirname(_HERE)
+
+
+def geometric_sizes(smallest, largest, factor=2):
+    """smallest, smallest * factor, ... up to largest."""
+    sizes = []
+    size = smallest
+    while size <= largest:
+        sizes.append(int(size))
+        size *= factor
+    return sizes
+
+
+def _time_call(func, args, number):
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        begin = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        return time.perf_counter() - begin
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(func, make_input, sizes, repeat=5, warmup=1, min_time=0.002):
+    """Best seconds per call of func(*make_input(n)) for every n in sizes."""
+    times = []
+    for n in sizes:
+        args = make_input(n)
+        if not isinstance(args, tuple):
+            args = (args,)
+        for _ in range(warmup):
+            func(*args)
+
+        # Enough calls per timing to be well above timer resolution
+        number = 1
+        elapsed = _time_call(func, args, number)
+        while elapsed < min_time:
+            number *= 2
+            elapsed = _time_call(func, args, number)
+
+        samples = [elapsed / number]
+        samples += [_time_call(func, args, number) / number for _ in range(repeat - 1)]
+        times.append(min(samples))
+    return times
+
+
+def _fit_model(name, model, sizes, times):
+    features = [model(n) for n in sizes]
+    weights = [1 / (t * t) for t in times]
+    s0 = sum(weights)
+    s1 = sum(w * f for w, f in zip(weights, features))
+    s2 = sum(w * f * f for w, f in zip(weights, features))
+    t0 = sum(w * t for w, t in zip(weights, times))
+    t1 = sum(w * f * t for w, f, t in zip(weights, features, times))
+
+    determinant = s0 * s2 - s1 * s1
+    if determinant <= 1e-12 * s0 * s2:
+        intercept, coefficient = t0 / s0, 0.0
+    else:
+        coefficient = (s0 * t1 - s1 * t0) / determinant
+        intercept = (t0 - coefficient * s1) / s0
+        if coefficient < 0:
+            intercept, coefficient = t0 / s0, 0.0
+        elif intercept < 0:
+            intercept, coefficient = 0.0, t1 / s2
+
+    error = math.sqrt(sum(((intercept + coefficient * f - t) / t) ** 2
+                          for f, t in zip(features, times)) / len(times))
+    return Fit(name, intercept, coefficient, error)
+
+
+def _slope(sizes, times):
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(t) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+def _growth_share(fit, model, sizes):
+    """Share of the fitted time at the largest n due to growth since the smallest."""
+    largest, smallest = max(sizes), min(sizes)
+    growth = fit.coefficient * (model(largest) - model(smallest))
+    total = fit.intercept + fit.coefficient * model(largest)
+    return growth / total if total > 0 else 0.0
+
+
+def fit_complexity(sizes, times, name=''):
+    """Fit every growth model and report the simplest one the data supports."""
+    if len(sizes) < 3:
+        raise ValueError('need timings for at least 3 sizes')
+    slope = _slope(sizes, times)
+    fits = []
+    for model_name, model in MODELS:
+        fit = _fit_model(model_name, model, sizes, times)
+        # A growing model that adds nothing over a constant is just O(1)
+        if model_name == 'O(1)':
+            fits.append(fit)
+        elif (fit.coefficient > 0 and slope >= FLAT_SLOPE and
+              _growth_share(fit, model, sizes) >= MIN_GROWTH_SHARE):
+            fitted_slope = _slope(sizes, [fit.intercept + fit.coefficient * model(n)
+                                          for n in sizes])
+            if slope >= fitted_slope / 2:
+                fits.append(fit)
+
+    # Simplest first; a bigger model has to earn its place
+    best = fits[0]
+    for fit in fits[1:]:
+        if fit.error <= best.error * (1 - MARGIN) and best.error - fit.error > NOISE_FLOOR:
+            best = fit
+
+    others = [fit for fit in fits if fit is not best]
+    runner_up = min(others, key=lambda fit: fit.error) if others else None
+    if runner_up is None:
+        confidence = 1.0
+    elif runner_up.error:
+        confidence = max(0.0, 1 - best.error / runner_up.error)
+    else:
+        confidence = 0.0
+    return ComplexityReport(name, list(sizes), list(times), best, runner_up,
+                            confidence, slope)
+
+
+def analyze(name, func, make_input, sizes, **measure_options):
+    times = measure(func, make_input, sizes, **measure_options)
+    return fit_complexity(sizes, times, name)
+
+
+def format_report(report):
+    runner_up = report.runner_up.model if report.runner_up else 'none'
+    lines = [f'{report.name}: {report.best.model} '
+             f'(confidence {report.confidence:.0%}, runner-up {runner_up}, '
+             f'slope {report.slope:.2f})']
+    for n, seconds in zip(report.sizes, report.times):
+        lines.append(f'    n = {n:>9,}  {seconds * 1e6:>12.2f} µs')
+    return '\n'.join(lines)
+
+
+# -------------------------------------------------------------------
+# Regression tracking between commits
+# -------------------------------------------------------------------
+
+def current_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=_HERE,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def check_regression(report, history_path, commit=None, min_confidence=0.2):
+    """Record report under commit; return a message if its class got worse."""
+    commit = commit or current_commit()
+    history = {}
+    if os.path.exists(history_path):
+        with open(history_path, encoding='utf-8') as file:
+            history = json.load(file)
+
+    entries = history.setdefault(report.name, [])
+    # Every fit is recorded, but only a confident one is a baseline:
+    # otherwise one noisy commit would quietly move the bar
+    previous = next((entry for entry in reversed(entries)
+                     if entry['commit'] != commit and entry['confidence'] >= min_confidence),
+                    None)
+    entries[:] = [entry for entry in entries if entry['commit'] != commit]
+    entries.append({'commit': commit, 'model': report.best.model,
+                    'confidence': round(report.confidence, 3),
+                    'slope': round(report.slope, 3)})
+
+    with open(history_path, 'w', encoding='utf-8') as file:
+        json.dump(history, file, indent=2, ensure_ascii=False)
+
+    if previous is None or _RANK[report.best.model] <= _RANK[previous['model']]:
+        return None
+    # A class change the fit itself isn't sure of is timing noise, not a regression
+    if report.confidence < min_confidence:
+        return None
+    return (f'REGRESSION {report.name}: {previous["model"]} at {previous["commit"]} '
+            f'-> {report.best.model} at {commit}')
+
+
+# -------------------------------------------------------------------
+# The readings' algorithms and the repository's own functions
+# -------------------------------------------------------------------
+
+def binary_search(target, nums):
+    """From logarithms.md."""
+    floor_index = -1
+    ceiling_index = len(nums)
+
+    while floor_index + 1 < ceiling_index:
+        distance = ceiling_index - floor_index
+        half_distance = distance // 2
+        guess_index = floor_index + half_distance
+
+        guess_value = nums[guess_index]
+        if guess_value == target:
+            return True
+
+        if guess_value > target:
+            ceiling_index = guess_index
+        else:
+            floor_index = guess_index
+
+    return False
+
+
+def merge_sort(list_to_sort):
+    """From logarithms.md."""
+    if len(list_to_sort) < 2:
+        return list_to_sort
+
+    mid_index = len(list_to_sort) // 2
+    left = list_to_sort[:mid_index]
+    right = list_to_sort[mid_index:]
+
+    sorted_left = merge_sort(left)
+    sorted_right = merge_sort(right)
+
+    sorted_list = []
+    left_index = 0
+    right_index = 0
+
+    while len(sorted_list) < len(left) + len(right):
+        if ((left_index < len(left)) and
+                (right_index == len(right) or
+                 sorted_left[left_index] < sorted_right[right_index])):
+            sorted_list.append(sorted_left[left_index])
+            left_index += 1
+        else:
+            sorted_list.append(sorted_right[right_index])
+            right_index += 1
+
+    return sorted_list
+
+
+def count_ordered_pairs(items):
+    """big_o_notation.md's print_all_possible_ordered_pairs, counting instead."""
+    count = 0
+    for first_item in items:
+        for second_item in items:
+            count += 1
+    return count
+
+
+def load_function(relative_path, name):
+    """Import name from a file under interview_source/ (folders have spaces)."""
+    path = os.path.join(_SOURCE_ROOT, relative_path)
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def default_suite():
+    """(name, function, make_input, sizes, expected class) for the demo run."""
+    rng = random.Random(0)
+
+    def sorted_numbers(n):
+        return sorted(rng.sample(range(4 * n), n))
+
+    def meetings(n):
+        starts = [rng.randint(0, 10 * n) for _ in range(n)]
+        return [(start, start + rng.randint(1, 20)) for start in starts]
+
+    def cafe_orders(n):
+        return list(range(0, n, 2)), list(range(1, n, 2)), list(range(n))
+
+    lookups = {}
+
+    def dict_input(n):
+        lookups.clear()
+        lookups.update((key, key) for key in range(n))
+        return (n // 2,)
+
+    merge_ranges = load_function('Practice/merging_meeting_times_bulk.py', 'merge_ranges')
+    cafe_v1 = load_function('Practice/cafe_order_checker_streaming.py',
+                            'is_first_come_first_served_v1')
+
+    return [
+        ('dict lookup', lookups.get, dict_input,
+         geometric_sizes(1 << 10, 1 << 17), 'O(1)'),
+        ('binary_search', lambda nums: binary_search(-1, nums), sorted_numbers,
+         geometric_sizes(1 << 10, 1 << 20, 4), 'O(log n)'),
+        ('sum', sum, lambda n: list(range(n)),
+         geometric_sizes(1 << 10, 1 << 17), 'O(n)'),
+        ('merge_sort', merge_sort, lambda n: [rng.random() for _ in range(n)],
+         geometric_sizes(1 << 8, 1 << 15), 'O(n log n)'),
+        ('merge_ranges', merge_ranges, meetings,
+         geometric_sizes(1 << 10, 1 << 17), 'O(n log n)'),
+        ('count_ordered_pairs', count_ordered_pairs, lambda n: list(range(n)),
+         geometric_sizes(1 << 6, 1 << 11), 'O(n²)'),
+        ('cafe checker v1 (slicing)', cafe_v1, cafe_orders,
+         geometric_sizes(1 << 9, 1 << 13), 'O(n²)'),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--history', help='JSON file of fitted classes per commit; '
+                                          'exit 1 if any function regressed')
+    parser.add_argument('--repeat', type=int, default=5)
+    options = parser.parse_args(argv)
+
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, 20_000))
+    regressions = []
+    try:
+        for name, func, make_input, sizes, expected in default_suite():
+            report = analyze(name, func, make_input, sizes, repeat=options.repeat)
+            print(format_report(report))
+            print(f'    expected {expected}')
+            if options.history:
+                message = check_regression(report, options.history)
+                if message:
+                    regressions.append(message)
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+    for message in regressions:
+        print(message)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    # The fit recovers clean synthetic curves, with or without overhead
+    # (here the growth term is as big as the overhead at the largest n)
+    sizes = geometric_sizes(1000, 256_000)
+    for name, model in MODELS:
+        times = [2e-6 * (1 + model(n) / model(sizes[-1])) for n in sizes]
+        assert fit_complexity(sizes, times).best.model == name, name
+        assert fit_complexity(sizes, [1e-9 * model(n) for n in sizes]).best.model == name, name
+
+    # Flat timings with a few percent of noise are O(1), never a big class
+    noisy = random.Random(3)
+    flat = [[1e-6 * noisy.uniform(0.97, 1.03) for _ in sizes] for _ in range(200)]
+    classes = [fit_complexity(sizes, times).best.model for times in flat]
+    assert classes.count('O(1)') >= 190, classes.count('O(1)')
+    assert 'O(n)' not in classes and 'O(n²)' not in classes
+    quadratic = fit_complexity(sizes, [1e-9 * n * n for n in sizes])
+    assert abs(quadratic.slope - 2) < 1e-9 and quadratic.confidence > 0.5
+
+    # A class getting worse between commits is flagged; staying put is not
+    with tempfile.TemporaryDirectory() as directory:
+        history = os.path.join(directory, 'history.json')
+        linear = fit_complexity(sizes, [1e-8 * n for n in sizes], 'f')
+        assert check_regression(linear, history, commit='aaa') is None
+        assert check_regression(linear, history, commit='bbb') is None
+        assert check_regression(quadratic._replace(name='f'), history, commit='ccc') \
+            .startswith('REGRESSION f: O(n) at bbb -> O(n²) at ccc')
+
+        # An unconfident class change is not reported, and not a new baseline
+        assert check_regression(linear._replace(name='h'), history, commit='a') is None
+        unsure = quadratic._replace(name='h', confidence=0.1)
+        assert check_regression(unsure, history, commit='b') is None
+        assert check_regression(quadratic._replace(name='h'), history, commit='c') \
+            .startswith('REGRESSION h: O(n) at a -> O(n²) at c')
+
+        # Noisy constant timings never flag a regression, commit after commit
+        for commit, times in enumerate(flat[:50]):
+            report = fit_complexity(sizes, times, 'g')
+            assert check_regression(report, history, commit=str(commit)) is None, report
+
+    print('All Big O harness tests passed!')
+    sys.exit(main())
@@ -0,0 +1,562 @@
+# ===================================================================
+# Differential Oracle - Prove a Fast Version Matches Its Reference
+# ===================================================================
+#
+# Companion code for big_o_notation.md (and every challenge that now
+# has a faster engine next to its obvious slow version).
+#
+# Every challenge in this repo has a slow-but-obviously-right
+# reference: the for loop in Loops/05_sum_of_squares.py, the if/elif
+# chains in control_flow/, the write-up solutions in interview_source/.
+# A faster version is only useful if it gives the SAME answers.
+#
+# A DifferentialPair holds one reference and any number of candidate
+# implementations, plus a generator of inputs. check() feeds all of
+# them:
+#   - hand-picked edge cases (empty, one element, negative, huge,
+#     boundary months / grades / planets, ...)
+#   - `trials` random inputs of small sizes, where bugs hide
+#   - one random input at every benchmark size, where overflow hides
+# and raises Mismatch - with the input and both outputs - the first
+# time a candidate disagrees. Exceptions are answers too: if the
+# reference raises ValueError, the candidate must raise ValueError.
+#
+# benchmark() then times every implementation on the SAME inputs in
+# the same run (big_o_harness.measure: warmup, calibrated repeats,
+# best of N) and prints a speedup table per input size:
+#
+#   sum of squares         n   reference      closed form
+#                      1,000     61.9 µs   267 ns   232x
+#
+#   python differential_oracle.py [--trials 200] [--only squares]
+#
+# ===================================================================
+
+import argparse
+import array
+import copy
+import operator
+import random
+import sys
+from itertools import repeat
+
+from big_o_harness import load_function, measure
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Mismatch(AssertionError):
+    """A candidate disagreed with the reference on some input."""
+
+    def __init__(self, pair, candidate, inputs, expected, got):
+        self.pair = pair
+        self.candidate = candidate
+        self.inputs = inputs
+        self.expected = expected
+        self.got = got
+        super().__init__(f'{pair}: {candidate} {_describe(got)} but the reference '
+                         f'{_describe(expected)} for input {_short(inputs)}')
+
+
+def _short(value, limit=120):
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+def _describe(outcome):
+    kind, value = outcome
+    return f'raised {value.__name__}' if kind == 'raised' else f'returned {_short(value)}'
+
+
+def _plain(value):
+    """Comparable form: arrays and buffers become lists or bytes."""
+    if np is not None and isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, array.array):
+        return value.tolist()
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, tuple):
+        return tuple(_plain(item) for item in value)
+    return value
+
+
+def _outcome(func, args):
+    # Fresh copies: some implementations work in place on their input
+    try:
+        return 'returned', _plain(func(*map(copy.copy, args)))
+    except Exception as error:
+        return 'raised', type(error)
+
+
+class DifferentialPair:
+    """A reference function, the candidates that must match it, and their inputs."""
+
+    def __init__(self, name, reference, candidates, generate, edge_cases=(),
+                 sizes=(10, 100, 1000), check_sizes=(0, 1, 2, 3, 5, 8, 20),
+                 equal=operator.eq):
+        self.name = name
+        self.reference = reference
+        # name -> function, same signature as the reference
+        self.candidates = dict(candidates)
+        # generate(rng, size) -> tuple of arguments
+        self.generate = generate
+        self.edge_cases = [args if isinstance(args, tuple) else (args,) for args in edge_cases]
+        self.sizes = sizes
+        self.check_sizes = check_sizes
+        self.equal = equal
+
+    def _inputs(self, trials, rng):
+        yield from self.edge_cases
+        for trial in range(trials):
+            yield self.generate(rng, self.check_sizes[trial % len(self.check_sizes)])
+        for size in self.sizes:
+            yield self.generate(rng, size)
+
+    def check(self, trials=200, seed=0):
+        """Compare every candidate with the reference; returns inputs checked."""
+        rng = random.Random(seed)
+        checked = 0
+        for args in self._inputs(trials, rng):
+            expected = _outcome(self.reference, args)
+            for name, candidate in self.candidates.items():
+                got = _outcome(candidate, args)
+                if expected[0] != got[0] or (
+                        expected[0] == 'raised' and not issubclass(got[1], expected[1])) or (
+                        expected[0] == 'returned' and not self.equal(expected[1], got[1])):
+                    raise Mismatch(self.name, name, args, expected, got)
+            checked += 1
+        return checked
+
+    def benchmark(self, seed=0, repeat=3):
+        """[(size, reference seconds, {candidate: seconds})] on shared inputs."""
+        rng = random.Random(seed)
+        inputs = {size: self.generate(rng, size) for size in self.sizes}
+
+        def timings(func):
+            return measure(func, inputs.__getitem__, self.sizes, repeat=repeat)
+
+        reference = timings(self.reference)
+        candidates = {name: timings(func) for name, func in self.candidates.items()}
+        return [(size, reference[i], {name: times[i] for name, times in candidates.items()})
+                for i, size in enumerate(self.sizes)]
+
+    def format_table(self, rows):
+        names = list(self.candidates)
+        header = f'{self.name:<28} {"n":>10} {"reference":>11}'
+        header += ''.join(f' {name:>{max(len(name), 16)}}' for name in names)
+        lines = [header]
+        for size, reference, candidates in rows:
+            line = f'{"":<28} {size:>10,} {_format_seconds(reference):>11}'
+            for name in names:
+                speedup = reference / candidates[name]
+                speedup = f'{speedup:.1f}x' if speedup < 100 else f'{speedup:,.0f}x'
+                cell = f'{_format_seconds(candidates[name])} {speedup:>8}'
+                line += f' {cell:>{max(len(name), 16)}}'
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def _format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.1f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+# -------------------------------------------------------------------
+# References copied from the beginner challenges (they call input()
+# at import time, so they can't be imported)
+# -------------------------------------------------------------------
+
+def sum_of_squares_loop(user):
+    """Loops/05_sum_of_squares.py."""
+    total = 0
+
+    for i in range(1, user + 1):
+        total = total + i**2
+
+    return total
+
+
+def sum_of_squares_formula(number):
+    """1² + ... + n² = n(n + 1)(2n + 1) / 6, and 0 when the loop never runs."""
+    if number < 1:
+        return 0
+    return number * (number + 1) * (2 * number + 1) // 6
+
+
+def sum_of_squares_map(number):
+    numbers = range(1, number + 1)
+    return sum(map(operator.mul, numbers, numbers))
+
+
+def high_school_grade(grade):
+    """control_flow/01_high_school_grades.py."""
+    if grade == 9:
+        return 'Freshman'
+    elif grade == 10:
+        return 'Sophomore'
+    elif grade == 11:
+        return 'Junior'
+    elif grade == 12:
+        return 'Senior'
+    else:
+        return 'TBD'
+
+
+def snapple_fact(number):
+    """control_flow/02_snapple_facts.py."""
+    if number == 0:
+        return 'Flamingos turn pink from eating shrimp.'
+    elif number == 1:
+        return 'The only food that doesn\'t spoil is honey.'
+    elif number == 2:
+        return 'Shrimp can only swim backwards.'
+    elif number == 3:
+        return 'A taste bud\'s life span is about 10 days.'
+    elif number == 4:
+        return 'It is impossible to sneeze while sleeping.'
+    elif number == 5:
+        return 'It is illegal to sing off-key in North Carolina.'
+    else:
+        return 'not a number from 0 to 5'
+
+
+def season(month):
+    """control_flow/03_seasons_of_the_year.py."""
+    if month == 1 or month == 2 or month == 3:
+        return "Winter 🌨️"
+    elif month == 4 or month == 5 or month == 6:
+        return "Spring 🌱"
+    elif month == 7 or month == 8 or month == 9:
+        return "Summer 🌞"
+    elif month == 10 or month == 11 or month == 12:
+        return "Autumn 🍂"
+    else:
+        return "Invalid"
+
+
+def planet_weight(user, destination):
+    """control_flow/04_planet_weights.py."""
+    if destination == 1:
+        weight = user * 0.38
+        return f'this is your weight in Mercury: {weight}'
+    elif destination == 2:
+        weight = user * 0.91
+        return f'this is your weight in Venus: {weight}'
+    elif destination == 3:
+        weight = user * 0.38
+        return f'this is your weight in Mars:{weight}'
+    elif destination == 4:
+        weight = user * 2.53
+        return f'this is your weight in Jupiter:{weight}'
+    elif destination == 5:
+        weight = user * 1.07
+        return f'this is your weight in Saturn:{weight}'
+    elif destination == 6:
+        weight = user * 0.89
+        return f'this is your weight in Uranus:{weight}'
+    elif destination == 7:
+        weight = user * 1.14
+        return f'this is your weight in Neptune:{weight}'
+    else:
+        return 'Invalid planet number'
+
+
+# Table-driven versions: one lookup instead of a chain of comparisons
+_GRADES = {9: 'Freshman', 10: 'Sophomore', 11: 'Junior', 12: 'Senior'}
+_FACTS = {number: snapple_fact(number) for number in range(6)}
+_SEASONS = {month: season(month) for month in range(1, 13)}
+# destination -> (name, factor, text between the colon and the weight)
+_PLANETS = {1: ('Mercury', 0.38, ' '), 2: ('Venus', 0.91, ' '), 3: ('Mars', 0.38, ''),
+            4: ('Jupiter', 2.53, ''), 5: ('Saturn', 1.07, ''), 6: ('Uranus', 0.89, ''),
+            7: ('Neptune', 1.14, '')}
+
+
+def planet_weight_table(user, destination):
+    planet = _PLANETS.get(destination)
+    if planet is None:
+        return 'Invalid planet number'
+    name, factor, space = planet
+    return f'this is your weight in {name}:{space}{user * factor}'
+
+
+def _each(func):
+    """Batch form of a one-value function: [func(v) for v in values]."""
+    def batch(values):
+        return [func(value) for value in values]
+    batch.__name__ = func.__name__ + '_each'
+    return batch
+
+
+def _lookup(table, default):
+    """Batch dict lookup: map() calls table.get in C, once per value."""
+    get = table.get
+
+    def batch(values):
+        return list(map(get, values, repeat(default, len(values))))
+    return batch
+
+
+# -------------------------------------------------------------------
+# The pairs
+# -------------------------------------------------------------------
+
+def _returning_buffer(func, kind):
+    """Wrap an in-place string function so it takes and returns str."""
+    def run(text):
+        if kind is list:
+            buffer = list(text)
+            func(buffer)
+            return ''.join(buffer)
+        buffer = bytearray(text, 'ascii')
+        func(buffer)
+        return buffer.decode('ascii')
+    return run
+
+
+def _words(rng, size):
+    words = [''.join(rng.choice('abcde') for _ in range(rng.randint(1, 6)))
+             for _ in range(size)]
+    return (' '.join(words),)
+
+
+def _control_values(rng, size, low, high):
+    # Mostly near the valid range, sometimes far outside it
+    values = [rng.randint(low - 3, high + 3) for _ in range(size)]
+    for index in range(0, size, 50):
+        values[index] = rng.choice([-(2 ** 40), 2 ** 40, 0, -1])
+    return (values,)
+
+
+def _control_pair(name, reference, table, default, low, high):
+    return DifferentialPair(
+        name, _each(reference), {'dict lookup': _lookup(table, default)},
+        lambda rng, size: _control_values(rng, size, low, high),
+        edge_cases=[[], [low - 1, low, high, high + 1], [-1, 0, 2 ** 63 - 1, 10 ** 30],
+                    [True, False]],
+        sizes=(100, 10_000, 1_000_000))
+
+
+def default_pairs():
+    """Every reference in the repo paired with its faster versions."""
+    highest_product_of_3 = load_function(
+        '3. Greedy algorithms/practice/highest_product_of_k.py', 'highest_product_of_3')
+    highest_product_of_k = load_function(
+        '3. Greedy algorithms/practice/highest_product_of_k.py', 'highest_product_of_k')
+    get_max_profit = load_function(
+        '3. Greedy algorithms/practice/apple_stocks_streaming.py', 'get_max_profit')
+    get_max_profit_stream = load_function(
+        '3. Greedy algorithms/practice/apple_stocks_streaming.py', 'get_max_profit_stream')
+    merge_ranges = load_function('Practice/merging_meeting_times_bulk.py', 'merge_ranges')
+    merge_ranges_counting = load_function('Practice/merging_meeting_times_bulk.py',
+                                          'merge_ranges_counting')
+    is_first_come_first_served = load_function(
+        'Practice/cafe_order_checker_streaming.py', 'is_first_come_first_served')
+    is_first_come_first_served_streaming = load_function(
+        'Practice/cafe_order_checker_streaming.py', 'is_first_come_first_served_streaming')
+    reverse_words = load_function('Practice/reverse_words_buffers.py', 'reverse_words')
+    reverse_words_in_place = load_function('Practice/reverse_words_buffers.py',
+                                           'reverse_words_in_place')
+    has_palindrome_permutation = load_function(
+        '2. Hashing and hash tables/Practice/permutation_palindrome_bitmask.py',
+        'has_palindrome_permutation')
+    has_palindrome_permutation_bytes = load_function(
+        '2. Hashing and hash tables/Practice/permutation_palindrome_bitmask.py',
+        'has_palindrome_permutation_bytes')
+    schedule_meetings = load_function('3. Greedy algorithms/reading/interval_scheduling.py',
+                                      'schedule_meetings')
+    Meetings = load_function('3. Greedy algorithms/reading/interval_scheduling.py', 'Meetings')
+
+    def ints(rng, size, low=-1000, high=1000):
+        return ([rng.randint(low, high) for _ in range(size)],)
+
+    def meetings(rng, size, longest=8):
+        starts = [rng.randint(0, 2 * size + 10) for _ in range(size)]
+        return ([(start, start + rng.randint(1, longest)) for start in starts],)
+
+    def cafe(rng, size):
+        orders = list(range(size))
+        take_out = sorted(rng.sample(orders, size // 2))
+        dine_in = sorted(set(orders).difference(take_out))
+        served = _interleave(rng, take_out, dine_in)
+        if size < 100:
+            # Small inputs are where the wrong answers are: break some.
+            # Large ones stay valid, so timings cover the whole stream
+            if rng.random() < 0.3:
+                rng.shuffle(served)
+            if served and rng.random() < 0.2:
+                served.pop(rng.randrange(len(served)))
+        return take_out, dine_in, served
+
+    def letters(rng, size):
+        return (''.join(rng.choice('abcdefghijklmnopqrstuvwxyz'[:rng.randint(1, 26)])
+                        for _ in range(size)),)
+
+    def merge_ranges_or_nothing(meetings):
+        # The write-up's merge_ranges raises IndexError on [] (it starts
+        # from sorted_meetings[0]); the counting sweep returns [] on
+        # purpose. Pin that difference here so [] is still checked
+        if not meetings:
+            return []
+        return merge_ranges(meetings)
+
+    def schedule_count(meetings):
+        # schedule_meetings raises IndexError on [] (it reads meetings[0]);
+        # Meetings counts an empty calendar as 0 rooms on purpose
+        if not meetings:
+            return 0
+        return len(schedule_meetings(meetings))
+
+    def meetings_count(meetings):
+        return len(Meetings.from_pairs(meetings).max_non_overlapping())
+
+    def planets(rng, size):
+        return ([(rng.choice([0.0, -1.5, 1e308, rng.uniform(0, 400)]), rng.randint(-1, 9))
+                 for _ in range(size)],)
+
+    def planets_each(func):
+        return lambda pairs: [func(user, destination) for user, destination in pairs]
+
+    return [
+        DifferentialPair(
+            'sum of squares', sum_of_squares_loop,
+            {'closed form': sum_of_squares_formula, 'sum(map)': sum_of_squares_map},
+            lambda rng, size: (rng.randint(-size, size) if size < 100 else size,),
+            edge_cases=[0, 1, 2, -1, -10 ** 6, 10 ** 5],
+            sizes=(10, 1000, 100_000, 1_000_000)),
+        _control_pair('high school grades', high_school_grade, _GRADES, 'TBD', 9, 12),
+        _control_pair('snapple facts', snapple_fact, _FACTS, 'not a number from 0 to 5', 0, 5),
+        _control_pair('seasons of the year', season, _SEASONS, 'Invalid', 1, 12),
+        DifferentialPair(
+            'planet weights', planets_each(planet_weight),
+            {'table lookup': planets_each(planet_weight_table)}, planets,
+            edge_cases=[[], [(70.0, 0), (70.0, 1), (70.0, 7), (70.0, 8)],
+                        [(-0.0, 3), (float('inf'), 4), (float('nan'), 5), (1e308, 4)]],
+            sizes=(100, 10_000, 1_000_000)),
+        DifferentialPair(
+            'highest product of 3', highest_product_of_3, {
+                'highest_product_of_k': highest_product_of_k,
+            }, ints,
+            edge_cases=[[], [1, 2], [1, 2, 3], [-10, -10, 1, 3, 2], [-5, -4, -3, -2],
+                        [0, 0, 0, -1], [10 ** 30, -10 ** 30, 10 ** 30, 7]],
+            sizes=(1000, 100_000)),
+        DifferentialPair(
+            'apple stocks', get_max_profit, {'streaming tracker': get_max_profit_stream},
+            lambda rng, size: ints(rng, size, 1, 500),
+            edge_cases=[[], [5], [5, 5], [10, 7, 5, 8, 11, 9], [9, 7, 4, 1]],
+            sizes=(1000, 100_000)),
+        DifferentialPair(
+            'merging meeting times', merge_ranges_or_nothing,
+            {'counting sweep': merge_ranges_counting}, meetings,
+            edge_cases=[[], [(4, 4)], [(1, 2), (2, 3)], [(0, 1), (3, 5), (4, 8)]],
+            sizes=(1000, 100_000)),
+        DifferentialPair(
+            'cafe order checker', is_first_come_first_served,
+            {'streaming': is_first_come_first_served_streaming}, cafe,
+            edge_cases=[([], [], []), ([1], [], []), ([], [], [1]),
+                        ([1, 3, 5], [2, 4, 6], [1, 2, 4, 6, 5, 3])],
+            sizes=(1000, 100_000)),
+        DifferentialPair(
+            'reverse words', _returning_buffer(reverse_words, list),
+            {'block-swap bytes': _returning_buffer(reverse_words_in_place, bytearray)},
+            _words, edge_cases=['', 'a', 'one two', 'cake pound steal'],
+            sizes=(1000, 100_000)),
+        DifferentialPair(
+            'permutation palindrome', has_palindrome_permutation,
+            {'parity bitmask': has_palindrome_permutation_bytes}, letters,
+            edge_cases=['', 'a', 'civic', 'ivicc', 'civil', 'livci'],
+            sizes=(1000, 1_000_000)),
+        DifferentialPair(
+            'meeting room scheduling', schedule_count, {'Meetings (NumPy)': meetings_count},
+            meetings, edge_cases=[[], [(1, 2)], [(1, 3), (3, 4)], [(1, 4), (2, 3), (3, 5)]],
+            sizes=(1000, 100_000)),
+    ]
+
+
+def _interleave(rng, first, second):
+    merged = []
+    i = j = 0
+    while i < len(first) or j < len(second):
+        if j == len(second) or (i < len(first) and rng.random() < 0.5):
+            merged.append(first[i])
+            i += 1
+        else:
+            merged.append(second[j])
+            j += 1
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--trials', type=int, default=200,
+                        help='random small inputs per pair (plus edge cases)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', help='run pairs whose name contains this text')
+    parser.add_argument('--no-timing', action='store_true')
+    options = parser.parse_args(argv)
+
+    failures = 0
+    for pair in default_pairs():
+        if options.only and options.only not in pair.name:
+            continue
+        try:
+            checked = pair.check(options.trials, options.seed)
+        except Mismatch as mismatch:
+            print(f'MISMATCH {mismatch}')
+            failures += 1
+            continue
+        print(f'{pair.name}: {checked} inputs, all candidates agree')
+        if not options.no_timing:
+            print(pair.format_table(pair.benchmark(options.seed)))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    # A correct candidate passes; a buggy one is caught on the right input
+    squares = DifferentialPair('squares', sum_of_squares_loop,
+                               {'closed form': sum_of_squares_formula},
+                               lambda rng, size: (rng.randint(-size, size),))
+    assert squares.check(trials=50) == 50 + len(squares.sizes)
+
+    unguarded = DifferentialPair(
+        'squares', sum_of_squares_loop,
+        {'no guard': lambda n: n * (n + 1) * (2 * n + 1) // 6},
+        lambda rng, size: (size,), edge_cases=[3, -2])
+    try:
+        unguarded.check()
+        assert False, 'Should raise error'
+    except Mismatch as mismatch:
+        assert mismatch.inputs == (-2,) and (mismatch.expected, mismatch.got) == \
+            (('returned', 0), ('returned', -1))
+
+    # Raising the same exception counts as agreeing; a different one does not
+    def strict(values):
+        if not values:
+            raise ValueError('empty')
+        return max(values)
+
+    assert DifferentialPair('max', strict, {'max': lambda values: strict(values)},
+                            lambda rng, size: ([rng.random() for _ in range(size)],),
+                            edge_cases=[[]]).check(trials=10) > 0
+    try:
+        DifferentialPair('max', strict, {'default': lambda values: max(values, default=None)},
+                         lambda rng, size: ([1],), edge_cases=[[]]).check()
+        assert False, 'Should raise error'
+    except Mismatch as mismatch:
+        assert mismatch.expected == ('raised', ValueError)
+        assert mismatch.got == ('returned', None)
+
+    # In-place candidates get their own copy of every input
+    def sort_in_place(values):
+        values.sort()
+        return values
+    assert DifferentialPair('sort', sorted, {'in place': sort_in_place},
+                            lambda rng, size: ([rng.random() for _ in range(size)],)).check()
+
+    print('All differential oracle tests passed!')
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# ===================================================================
+# Dynamic Array - Compact Typed Storage with Pluggable Growth
+# ===================================================================
+#
+# Companion code for dynamic_array.md.
+#
+# A Python list is a dynamic array of POINTERS. Each int it holds is
+# a separate heap object (28+ bytes) plus an 8-byte slot, so a list of
+# a hundred million ints costs several GB. DynamicArray keeps the same
+# size / capacity / end_index design as the write-up, but its
+# underlying fixed-size array is an array.array of raw machine values:
+# 8 bytes per int64, no per-element objects.
+#
+#   size      = self._size          (how many elements are in use)
+#   capacity  = len(self._data)     (slots in the underlying array)
+#   end_index = self._size          (where the next append goes)
+#
+# When an append finds size == capacity, we do exactly the write-up's
+# process: allocate a new, bigger fixed array, copy every element
+# across (one memcpy of the used bytes), and drop the old one.
+#
+# How much bigger is a GROWTH POLICY - a function
+#   (capacity, needed) -> new capacity
+# so the write-up's "why double?" question can be measured:
+#
+#   growth_factor(2)    - doubling, the write-up's strategy
+#   growth_factor(1.5)  - less wasted space, a few more copies
+#   fixed_chunk(n)      - "add n slots": O(n) copies per append on
+#                         average, the trap the write-up warns about
+#
+# Every resize is counted (resizes, elements_copied), so the amortized
+# cost is visible: elements_copied / size stays below a constant for
+# the multiplicative policies and grows with size for fixed chunks.
+#
+# ===================================================================
+
+import array
+import sys
+import time
+import tracemalloc
+
+_SIGNED = 'bhilq'
+_UNSIGNED = 'BHILQ'
+_FLOAT = 'fd'
+
+
+def growth_factor(factor):
+    """Grow capacity by a constant factor (amortized O(1) appends)."""
+    if factor <= 1:
+        raise ValueError('growth factor must be greater than 1')
+
+    def grow(capacity, needed):
+        return max(needed, int(capacity * factor) + 1)
+    grow.__name__ = f'growth_factor({factor})'
+    return grow
+
+
+def fixed_chunk(chunk):
+    """Grow capacity by a constant number of slots (O(n) amortized appends)."""
+    if chunk < 1:
+        raise ValueError('chunk must be at least 1')
+
+    def grow(capacity, needed):
+        return max(needed, capacity + chunk)
+    grow.__name__ = f'fixed_chunk({chunk})'
+    return grow
+
+
+def _kind(format_char):
+    for kind in (_SIGNED, _UNSIGNED, _FLOAT):
+        if format_char in kind:
+            return kind
+    return None
+
+
+class DynamicArray:
+    """A growable array of one machine type, stored in an array.array."""
+
+    __slots__ = ('typecode', 'growth', 'resizes', 'elements_copied', '_data', '_size')
+
+    def __init__(self, typecode='q', values=(), capacity=10, growth=None):
+        self.typecode = typecode
+        self.growth = growth or growth_factor(2)
+        self.resizes = 0
+        self.elements_copied = 0
+        self._data = array.array(typecode, [0]) * capacity
+        self._size = 0
+        self.extend(values)
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    @property
+    def itemsize(self):
+        return self._data.itemsize
+
+    @property
+    def nbytes(self):
+        """Bytes held by the underlying fixed-size array."""
+        return len(self._data) * self._data.itemsize
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, needed):
+        if needed <= len(self._data):
+            return
+        new_capacity = self.growth(len(self._data), needed)
+        new_data = array.array(self.typecode, [0]) * new_capacity
+        used = self._size * self.itemsize
+        memoryview(new_data).cast('B')[:used] = memoryview(self._data).cast('B')[:used]
+        self._data = new_data
+        self.resizes += 1
+        self.elements_copied += self._size
+
+    def append(self, value):
+        if self._size == len(self._data):
+            self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def _buffer_view(self, values):
+        # A byte view of values if it is a buffer of our element type
+        try:
+            view = memoryview(values)
+        except TypeError:
+            return None
+        format_char = view.format.lstrip('@=<')
+        if view.itemsize != self.itemsize or _kind(format_char) != _kind(self.typecode):
+            view.release()
+            return None
+        if not view.c_contiguous:
+            view.release()
+            return None
+        return view.cast('B')
+
+    def extend(self, values):
+        """Append many values. Matching buffers are copied without boxing."""
+        view = self._buffer_view(values)
+        if view is None:
+            # array.array(typecode, bytes) would read bytes as raw machine
+            # values, so other buffers go in element by element
+            try:
+                with memoryview(values) as other:
+                    values = other.tolist()
+            except TypeError:
+                pass
+            # Convert in C (array.array from an iterable), then copy bytes
+            view = memoryview(array.array(self.typecode, values)).cast('B')
+
+        with view:
+            count = len(view) // self.itemsize
+            self._reserve(self._size + count)
+            start = self._size * self.itemsize
+            memoryview(self._data).cast('B')[start:start + len(view)] = view
+            self._size += count
+
+    def pop(self):
+        if not self._size:
+            raise IndexError('pop from empty DynamicArray')
+        self._size -= 1
+        return self._data[self._size]
+
+    def shrink_to_fit(self):
+        """Drop unused capacity (one copy of the used elements)."""
+        self._data = self._data[:self._size]
+
+    def _check_index(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('DynamicArray index out of range')
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._data[slice(*index.indices(self._size))]
+        return self._data[self._check_index(index)]
+
+    def __setitem__(self, index, value):
+        self._data[self._check_index(index)] = value
+
+    def __iter__(self):
+        data = self._data
+        for index in range(self._size):
+            yield data[index]
+
+    def view(self):
+        """Zero-copy memoryview of the elements in use (invalid after a resize)."""
+        return memoryview(self._data)[:self._size]
+
+    def to_array(self):
+        return self._data[:self._size]
+
+    def __repr__(self):
+        return (f'DynamicArray({self.typecode!r}, size={self._size}, '
+                f'capacity={self.capacity}, growth={self.growth.__name__})')
+
+
+def _peak_bytes(build):
+    tracemalloc.start()
+    try:
+        result = build()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def benchmark_amortized(sizes=(10_000, 100_000, 1_000_000)):
+    """Copies per append for each growth policy (the write-up's amortized cost)."""
+    policies = [growth_factor(2), growth_factor(1.5), fixed_chunk(1024)]
+    print(f'{"policy":<20} {"n":>10} {"resizes":>8} {"copies/append":>14} '
+          f'{"unused %":>9} {"ns/append":>10}')
+    for grow in policies:
+        for n in sizes:
+            values = DynamicArray('q', capacity=1, growth=grow)
+            begin = time.perf_counter()
+            for value in range(n):
+                values.append(value)
+            elapsed = time.perf_counter() - begin
+            unused = 100 * (values.capacity - n) / values.capacity
+            print(f'{grow.__name__:<20} {n:>10} {values.resizes:>8} '
+                  f'{values.elements_copied / n:>14.2f} {unused:>9.1f} '
+                  f'{elapsed / n * 1e9:>10.0f}')
+
+
+def benchmark_memory(n=1_000_000):
+    """Peak memory and build time against list and array.array."""
+    source = array.array('q', range(10**9, 10**9 + n))
+    print(f'{n:,} int64 values')
+    builds = [
+        ('list.append', lambda: [value for value in source]),
+        ('array.array.append', lambda: _append_all(array.array('q'), source)),
+        ('DynamicArray.append', lambda: _append_all(DynamicArray('q'), source)),
+        ('DynamicArray.extend(buffer)', lambda: DynamicArray('q', source)),
+    ]
+    for name, build in builds:
+        begin = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - begin
+        peak = _peak_bytes(build)
+        print(f'  {name:<28} {peak / n:>7.1f} bytes/value {elapsed * 1e3:>9.1f} ms')
+
+
+def _append_all(target, values):
+    for value in values:
+        target.append(value)
+    return target
+
+
+if __name__ == '__main__':
+    values = DynamicArray('q', capacity=2)
+    for value in (346, 360, 354):
+        values.append(value)
+    assert len(values) == 3 and values.capacity == 5
+    assert list(values) == [346, 360, 354]
+    assert values[-1] == 354 and values[0:2].tolist() == [346, 360]
+    values[1] = 7
+    assert values.pop() == 354 and list(values) == [346, 7]
+    for bad in (2, -3):
+        try:
+            values[bad]
+            assert False, 'Should raise error'
+        except IndexError:
+            pass
+
+    # extend() from matching buffers, other buffers and plain iterables
+    values.extend(array.array('q', [1, 2, 3]))
+    values.extend(array.array('i', [4, 5]))
+    values.extend(range(6, 9))
+    assert list(values) == [346, 7, 1, 2, 3, 4, 5, 6, 7, 8]
+    assert values.view().tolist() == list(values)
+
+    raw = DynamicArray('B', b'abc')
+    raw.extend(bytearray(b'def'))
+    assert bytes(raw.view()) == b'abcdef'
+
+    # Bytes into a wider type are small ints, not raw machine words
+    widened = DynamicArray('q')
+    widened.extend(b'\x01' * 8)
+    widened.extend(bytearray([1, 2, 3]))
+    assert list(widened) == [1] * 8 + [1, 2, 3]
+
+    # The write-up's example: doubling from capacity 1, 15 appends
+    doubled = DynamicArray('q', capacity=1, growth=lambda capacity, needed: 2 * capacity)
+    for value in range(15):
+        doubled.append(value)
+    assert doubled.elements_copied == 1 + 2 + 4 + 8
+    assert doubled.capacity == 16
+
+    try:
+        import numpy as np
+        values = DynamicArray('q')
+        values.extend(np.arange(5, dtype=np.int64))
+        values.extend(np.arange(5, dtype=np.int64)[::2])
+        assert list(values) == [0, 1, 2, 3, 4, 0, 2, 4]
+    except ImportError:
+        pass
+
+    print('All dynamic array tests passed!')
+    print(f'(list slots + int objects: about {8 + sys.getsizeof(10**9)} bytes per int)')
+    benchmark_amortized()
+    benchmark_memory()
@@ -0,0 +1,314 @@
+# ===================================================================
+# In-Place Algorithm - Chunked Element-Wise Kernels
+# ===================================================================
+#
+# Companion code for in_place_algorithm.md.
+#
+# square_list_in_place() and square_list_out_of_place() both run one
+# Python bytecode loop iteration per element (~50 ns each), and the
+# out-of-place version also allocates a second full list. This file
+# keeps the write-up's two shapes but, with NumPy, moves the loop into
+# C:
+#
+# 1. Kernels: square(), scale(), clip(), affine()
+#    - work on array.array, memoryview (bytearray, mmap, ...), NumPy
+#      arrays and plain lists
+#    - default is IN PLACE: the result overwrites `data`
+#    - out=buffer writes the result into another preallocated buffer
+#      of the same length instead ("out-of-place, but I own the
+#      memory"), like NumPy's out= argument
+#    - they return the buffer they wrote to
+#
+# 2. Chunked processing: the work is done chunk_size elements at a
+#    time. With NumPy every chunk is a zero-copy view and the ufunc
+#    writes straight into the destination, so NO temporary the size
+#    of the input is ever created - peak memory stays at the input
+#    size. (data ** 2 on a NumPy array allocates a full second array.)
+#    Without NumPy, each chunk is transformed (by a C-level map() where
+#    possible) and written back by slice assignment; the only temporary
+#    is one chunk.
+#
+# 3. CopyOnWrite - the "safer" out-of-place behaviour without copying
+#    everything up front. The source is never modified; a chunk gets
+#    its own private copy only the first time a kernel CHANGES it. A
+#    clip() that touches 1% of the chunks copies 1% of the data.
+#
+# Integer NumPy buffers wrap around on overflow (like C); array.array
+# and list buffers raise OverflowError / keep Python ints instead.
+#
+# ===================================================================
+
+import array
+import operator
+import time
+import tracemalloc
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_SIZE = 1 << 16
+
+
+def square_list_in_place(int_list):
+    """Reference in-place solution from the write-up."""
+    for index, element in enumerate(int_list):
+        int_list[index] *= element
+
+
+def square_list_out_of_place(int_list):
+    """Reference out-of-place solution from the write-up."""
+    squared_list = [None] * len(int_list)
+    for index, element in enumerate(int_list):
+        squared_list[index] = element ** 2
+    return squared_list
+
+
+def _as_ndarray(buffer):
+    if isinstance(buffer, np.ndarray):
+        return buffer
+    # Shares memory with the buffer; nothing is copied
+    return np.asarray(memoryview(buffer))
+
+
+def _python_chunk(target, values):
+    if isinstance(target, list):
+        return list(values)
+    if isinstance(target, memoryview):
+        return array.array(target.format, values)
+    return array.array(target.typecode, values)
+
+
+def _apply(data, out, chunk_size, vectorized, elementwise):
+    target = data if out is None else out
+    size = len(data)
+    if len(target) != size:
+        raise ValueError('out must have the same length as data')
+
+    if np is not None and not isinstance(target, list) and not isinstance(data, list):
+        source = _as_ndarray(data)
+        destination = _as_ndarray(target)
+        if not destination.flags.writeable:
+            raise TypeError('destination buffer is read-only')
+        for start in range(0, size, chunk_size):
+            stop = start + chunk_size
+            vectorized(source[start:stop], destination[start:stop])
+        return target
+
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        target[start:stop] = _python_chunk(target, elementwise(data[start:stop]))
+    return target
+
+
+def square(data, out=None, chunk_size=CHUNK_SIZE):
+    """x -> x * x, in place (or into out)."""
+    def vectorized(source, destination):
+        np.multiply(source, source, out=destination)
+    return _apply(data, out, chunk_size, vectorized,
+                  lambda chunk: map(operator.mul, chunk, chunk))
+
+
+def scale(data, factor, out=None, chunk_size=CHUNK_SIZE):
+    """x -> x * factor, in place (or into out)."""
+    def vectorized(source, destination):
+        np.multiply(source, factor, out=destination)
+    return _apply(data, out, chunk_size, vectorized,
+                  lambda chunk: map(operator.mul, chunk, repeat(factor)))
+
+
+def clip(data, low, high, out=None, chunk_size=CHUNK_SIZE):
+    """x -> min(max(x, low), high), in place (or into out)."""
+    if low > high:
+        raise ValueError('low must not be greater than high')
+
+    def vectorized(source, destination):
+        np.clip(source, low, high, out=destination)
+    return _apply(data, out, chunk_size, vectorized,
+                  lambda chunk: (min(max(x, low), high) for x in chunk))
+
+
+def affine(data, factor, offset, out=None, chunk_size=CHUNK_SIZE):
+    """x -> x * factor + offset, in place (or into out)."""
+    def vectorized(source, destination):
+        np.multiply(source, factor, out=destination)
+        np.add(destination, offset, out=destination)
+    return _apply(data, out, chunk_size, vectorized,
+                  lambda chunk: (x * factor + offset for x in chunk))
+
+
+class CopyOnWrite:
+    """Out-of-place results over a shared source, copied one chunk at a time."""
+
+    __slots__ = ('source', 'chunk_size', '_chunks')
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.source = source
+        self.chunk_size = chunk_size
+        # chunk number -> private copy of that chunk, once it differs
+        self._chunks = {}
+
+    def __len__(self):
+        return len(self.source)
+
+    @property
+    def copied_chunks(self):
+        return len(self._chunks)
+
+    def _chunk(self, number):
+        private = self._chunks.get(number)
+        if private is not None:
+            return private
+        start = number * self.chunk_size
+        if np is not None and not isinstance(self.source, list):
+            return _as_ndarray(self.source)[start:start + self.chunk_size]
+        return self.source[start:start + self.chunk_size]
+
+    def apply(self, kernel, *args):
+        """Run a kernel (square, scale, clip, affine) without touching source."""
+        for number in range(-(-len(self.source) // self.chunk_size)):
+            private = self._chunks.get(number)
+            if private is not None:
+                kernel(private, *args)
+                continue
+
+            shared = self._chunk(number)
+            result = kernel(shared, *args, out=_blank_like(shared))
+            if _differs(result, shared):
+                self._chunks[number] = result
+        return self
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.source)
+        if not 0 <= index < len(self.source):
+            raise IndexError('CopyOnWrite index out of range')
+        number, offset = divmod(index, self.chunk_size)
+        return self._chunk(number)[offset]
+
+    def __iter__(self):
+        for number in range(-(-len(self.source) // self.chunk_size)):
+            yield from self._chunk(number)
+
+    def materialize(self):
+        """One full, independent copy with every change applied."""
+        chunks = [self._chunk(number)
+                  for number in range(-(-len(self.source) // self.chunk_size))]
+        if np is not None and not isinstance(self.source, list):
+            return np.concatenate(chunks) if chunks else _as_ndarray(self.source)[:0].copy()
+        result = self.source[:0]
+        for chunk in chunks:
+            result.extend(chunk)
+        return result
+
+
+def _blank_like(chunk):
+    if np is not None and isinstance(chunk, np.ndarray):
+        return np.empty_like(chunk)
+    if isinstance(chunk, list):
+        return [None] * len(chunk)
+    return array.array(chunk.typecode, [0]) * len(chunk)
+
+
+def _differs(result, shared):
+    if np is not None and isinstance(result, np.ndarray):
+        return not np.array_equal(result, shared)
+    return result != shared
+
+
+def _peak_bytes(run):
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def benchmark(n=2_000_000):
+    """ns/element and extra peak memory for each way of squaring n floats."""
+    values = [float(i % 1000) for i in range(n)]
+    numbers = array.array('d', values)
+    runs = [
+        ('square_list_in_place (list)', lambda: list(values), square_list_in_place),
+        ('square_list_out_of_place', lambda: values, square_list_out_of_place),
+        ('square(array.array)', lambda: numbers, square),
+    ]
+    if np is not None:
+        readings = np.full(n, 20.0)
+        readings[:1000] = 1e6  # outliers in the first chunk only
+        runs += [
+            ('numpy data ** 2 (new array)', lambda: np.array(values), lambda data: data ** 2),
+            ('square(ndarray) in place', lambda: np.array(values), square),
+            ('CopyOnWrite clip, 1 bad chunk', lambda: readings,
+             lambda data: CopyOnWrite(data).apply(clip, 0.0, 100.0)),
+        ]
+
+    print(f'{n:,} floats ({n * 8 / 1e6:.0f} MB as float64)')
+    print(f'  {"":<30} {"ns/element":>11} {"extra peak MB":>14}')
+    for name, setup, run in runs:
+        data = setup()
+        begin = time.perf_counter()
+        run(data)
+        elapsed = time.perf_counter() - begin
+        data = setup()
+        extra = _peak_bytes(lambda: run(data)) / 1e6
+        print(f'  {name:<30} {elapsed / n * 1e9:>11.1f} {extra:>14.1f}')
+
+
+if __name__ == '__main__':
+    numbers = [2, 3, 4, 5]
+    square_list_in_place(numbers)
+    assert numbers == [4, 9, 16, 25]
+    assert square_list_out_of_place([2, 3, 4, 5]) == [4, 9, 16, 25]
+
+    for chunk_size in (1, 3, CHUNK_SIZE):
+        for make in (list, lambda v: array.array('q', v),
+                     lambda v: memoryview(array.array('q', v))):
+            data = make([2, -3, 4, 5, -6])
+            assert square(data, chunk_size=chunk_size) is data
+            assert list(data) == [4, 9, 16, 25, 36]
+            scale(data, 2, chunk_size=chunk_size)
+            assert list(data) == [8, 18, 32, 50, 72]
+            clip(data, 10, 40, chunk_size=chunk_size)
+            assert list(data) == [10, 18, 32, 40, 40]
+            affine(data, 3, -1, chunk_size=chunk_size)
+            assert list(data) == [29, 53, 95, 119, 119]
+
+        # out= leaves data alone
+        source = array.array('d', [1.5, -2.0, 3.0])
+        out = array.array('d', [0.0] * 3)
+        assert affine(source, 2.0, 1.0, out=out, chunk_size=chunk_size) is out
+        assert list(out) == [4.0, -3.0, 7.0] and list(source) == [1.5, -2.0, 3.0]
+
+    try:
+        square([1, 2], out=[0])
+        assert False, 'Should raise error'
+    except ValueError:
+        pass
+
+    # Copy-on-write: source untouched, unchanged chunks never copied
+    source = array.array('q', range(100))
+    view = CopyOnWrite(source, chunk_size=10).apply(clip, 0, 94)
+    assert view.copied_chunks == 1
+    assert list(view) == [min(i, 94) for i in range(100)]
+    view.apply(scale, 2)
+    assert view.copied_chunks == 10 and view[-1] == 188 and view[3] == 6
+    assert list(source) == list(range(100))
+    assert list(view.materialize()) == [2 * min(i, 94) for i in range(100)]
+
+    if np is not None:
+        matrix = np.arange(10, dtype=np.float64)
+        assert square(matrix, chunk_size=4) is matrix
+        assert matrix.tolist() == [float(i * i) for i in range(10)]
+        try:
+            square(memoryview(b'read only'))
+            assert False, 'Should raise error'
+        except TypeError:
+            pass
+
+    print('All in-place kernel tests passed!')
+    benchmark()
@@ -0,0 +1,284 @@
+# ===================================================================
+# Array Slicing - Copy-Free Slice Views
+# ===================================================================
+#
+# Companion code for array_slicing.md (and the recursive
+# is_first_come_first_served_v1() in Practice/cafe_order_checker.md).
+#
+# my_list[1:] allocates a new list and copies every element after the
+# first: O(m) time and space for a slice of size m. A recursive
+# function that passes my_list[1:] down n levels copies
+# n-1 + n-2 + ... + 1 elements - O(n²) - just to move one step along.
+#
+# SliceView is "Technique 2: use pointers/indices" packaged up so the
+# code can keep its slicing shape. It stores
+#
+#   (base, start, stop, step)
+#
+# and translates every index into an index of base. Slicing a view
+# returns another view over the SAME base - the two slices are
+# composed, nothing is copied - so view[1:] is O(1):
+#
+#   numbers = [10, 11, 12, 13, 14, 15, 16, 17]
+#   evens = SliceView(numbers)[::2]     # base indexes 0, 2, 4, 6
+#   middle = evens[1:3]                 # base indexes 2, 4
+#   middle[0] -> numbers[2] -> 12
+#
+# The index arithmetic is done by range(), which already knows how to
+# compose slices in O(1): range(0, 8, 2)[1:3] == range(2, 6, 2).
+#
+# Works over anything indexable: lists, tuples, strings, array.array,
+# bytes/bytearray/memoryview and NumPy arrays. Call materialize() when
+# a real copy is needed. Slicing a memoryview or a NumPy array gives
+# another view, so those are copied explicitly (a memoryview becomes
+# bytes).
+#
+# ===================================================================
+
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SliceView:
+    """A copy-free view of base[start:stop:step]."""
+
+    __slots__ = ('base', '_indexes')
+
+    def __init__(self, base, start=None, stop=None, step=None):
+        if isinstance(base, SliceView):
+            # Compose with the existing view instead of stacking views
+            self.base = base.base
+            self._indexes = base._indexes[start:stop:step]
+        else:
+            self.base = base
+            self._indexes = range(len(base))[start:stop:step]
+
+    @classmethod
+    def _over(cls, base, indexes):
+        view = cls.__new__(cls)
+        view.base = base
+        view._indexes = indexes
+        return view
+
+    @property
+    def start(self):
+        return self._indexes.start
+
+    @property
+    def stop(self):
+        return self._indexes.stop
+
+    @property
+    def step(self):
+        return self._indexes.step
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._over(self.base, self._indexes[index])
+        return self.base[self._indexes[index]]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            raise TypeError('SliceView supports item assignment only')
+        self.base[self._indexes[index]] = value
+
+    def __iter__(self):
+        return map(self.base.__getitem__, self._indexes)
+
+    def __reversed__(self):
+        return map(self.base.__getitem__, reversed(self._indexes))
+
+    def __bool__(self):
+        return bool(self._indexes)
+
+    def __eq__(self, other):
+        # Lengths first, views included: zip() stops at the shorter side
+        try:
+            if len(other) != len(self):
+                return False
+        except TypeError:
+            return NotImplemented
+        return all(mine == theirs for mine, theirs in zip(self, other))
+
+    __hash__ = None
+
+    def _as_slice(self):
+        indexes = self._indexes
+        # range(5, -1, -1) means "down to index 0"; as a slice that is None
+        stop = indexes.stop if indexes.stop >= 0 else None
+        return slice(indexes.start, stop, indexes.step)
+
+    def materialize(self):
+        """Copy the viewed elements into a new object of base's type."""
+        if not self._indexes:
+            copied = self.base[0:0]
+        else:
+            copied = self.base[self._as_slice()]
+        # These slice to views of the same memory, not copies
+        if isinstance(copied, memoryview):
+            return copied.tobytes()
+        if np is not None and isinstance(copied, np.ndarray):
+            return copied.copy()
+        return copied
+
+    def __repr__(self):
+        return (f'SliceView(<{type(self.base).__name__} of {len(self.base)}>, '
+                f'start={self.start}, stop={self.stop}, step={self.step})')
+
+
+# -------------------------------------------------------------------
+# Recursive algorithms, with slices and with views
+# -------------------------------------------------------------------
+
+def recursive_sum(numbers):
+    """O(n²): every level copies numbers[1:]."""
+    if not numbers:
+        return 0
+    return numbers[0] + recursive_sum(numbers[1:])
+
+
+def recursive_sum_view(numbers):
+    """O(n): the same code over a SliceView."""
+    return _recursive_sum(SliceView(numbers))
+
+
+def _recursive_sum(numbers):
+    if not numbers:
+        return 0
+    return numbers[0] + _recursive_sum(numbers[1:])
+
+
+def is_first_come_first_served_v1(take_out_orders, dine_in_orders, served_orders):
+    """The cafe checker's recursive version; O(n²) on lists, O(n) on views."""
+    if len(served_orders) == 0:
+        return True
+
+    if (len(take_out_orders) and
+            take_out_orders[0] == served_orders[0]):
+        return is_first_come_first_served_v1(
+            take_out_orders[1:],
+            dine_in_orders,
+            served_orders[1:]
+        )
+    elif (len(dine_in_orders) and
+          dine_in_orders[0] == served_orders[0]):
+        return is_first_come_first_served_v1(
+            take_out_orders,
+            dine_in_orders[1:],
+            served_orders[1:]
+        )
+    else:
+        return False
+
+
+def is_first_come_first_served_view(take_out_orders, dine_in_orders, served_orders):
+    return is_first_come_first_served_v1(SliceView(take_out_orders),
+                                         SliceView(dine_in_orders),
+                                         SliceView(served_orders))
+
+
+def benchmark(sizes=(1000, 2000, 4000, 8000)):
+    """Time slicing vs views as n doubles: O(n²) quadruples, O(n) doubles."""
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, 2 * max(sizes) + 100))
+    try:
+        print(f'{"n":>8} {"sum, slices":>12} {"sum, views":>12} '
+              f'{"cafe, slices":>13} {"cafe, views":>12}  (ms)')
+        previous = None
+        for n in sizes:
+            numbers = list(range(n))
+            take_out = list(range(0, n, 2))
+            dine_in = list(range(1, n, 2))
+            served = list(range(n))
+
+            timings = []
+            for run in (lambda: recursive_sum(numbers),
+                        lambda: recursive_sum_view(numbers),
+                        lambda: is_first_come_first_served_v1(take_out, dine_in, served),
+                        lambda: is_first_come_first_served_view(take_out, dine_in, served)):
+                begin = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - begin)
+
+            print(f'{n:>8} ' + ' '.join(f'{t * 1e3:>12.2f}' for t in timings))
+            if previous:
+                growth = ' '.join(f'{now / before:>12.1f}x'
+                                  for now, before in zip(timings, previous))
+                print(f'{"growth":>8} {growth}')
+            previous = timings
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+
+if __name__ == '__main__':
+    import array
+
+    numbers = [10, 11, 12, 13, 14, 15, 16, 17]
+    view = SliceView(numbers)
+    evens = view[::2]
+    middle = evens[1:3]
+    assert list(evens) == [10, 12, 14, 16]
+    assert list(middle) == [12, 14] and middle.base is numbers
+    assert (middle.start, middle.stop, middle.step) == (2, 6, 2)
+    assert middle[0] == 12 and middle[-1] == 14 and len(middle) == 2
+    assert list(reversed(middle)) == [14, 12]
+
+    # Every composition of slices matches slicing the real list
+    import random
+    rng = random.Random(0)
+    bounds = [None, -9, -3, -1, 0, 1, 2, 5, 9]
+    steps = [None, 1, 2, 3, -1, -2]
+    for _ in range(2000):
+        first = slice(rng.choice(bounds), rng.choice(bounds), rng.choice(steps))
+        second = slice(rng.choice(bounds), rng.choice(bounds), rng.choice(steps))
+        composed = SliceView(numbers)[first][second]
+        assert list(composed) == numbers[first][second]
+        assert composed.materialize() == numbers[first][second]
+        assert composed == numbers[first][second]
+        assert (composed == SliceView(numbers)) == (numbers[first][second] == numbers)
+
+    # Views of different lengths are never equal, even sharing a prefix
+    assert SliceView([1, 2, 3]) != SliceView([1, 2])
+    assert SliceView([]) != SliceView([5, 6])
+    assert SliceView(numbers)[:2] != SliceView(numbers)
+
+    # Writes go through to the base
+    middle[1] = 99
+    assert numbers[4] == 99
+
+    # Strings, arrays and buffers
+    assert SliceView('hello world')[6:].materialize() == 'world'
+    assert SliceView(array.array('i', range(6)))[::-2].materialize() == array.array('i', [5, 3, 1])
+    assert bytes(SliceView(bytearray(b'abcdef'), 1, 4).materialize()) == b'bcd'
+    buffer = bytearray(b'abcdef')
+    copied = SliceView(memoryview(buffer))[2:][1:].materialize()
+    buffer[3] = ord('X')
+    assert copied == b'def'
+    if np is not None:
+        grid = np.arange(6)
+        copied = SliceView(grid)[::2].materialize()
+        grid[2] = 99
+        assert copied.tolist() == [0, 2, 4] and not np.shares_memory(copied, grid)
+    assert SliceView([1, 2, 3])[5:].materialize() == []
+
+    assert recursive_sum(list(range(100))) == recursive_sum_view(list(range(100))) == 4950
+    cafe_cases = [
+        ([1, 3, 5], [2, 4, 6], [1, 2, 4, 6, 5, 3], False),
+        ([17, 8, 24], [12, 19, 2], [17, 8, 12, 19, 24, 2], True),
+        ([], [], [], True),
+        ([1, 2], [], [1, 2, 3], False),
+    ]
+    for take_out, dine_in, served, expected in cafe_cases:
+        assert is_first_come_first_served_v1(take_out, dine_in, served) == expected
+        assert is_first_come_first_served_view(take_out, dine_in, served) == expected
+
+    print('All slice view tests passed!')
+    benchmark()
@@ -0,0 +1,257 @@
+# ===================================================================
+# PROBLEM: Inflight Entertainment - Precomputed Movie Pair Index
+# ===================================================================
+#
+# Companion code for inflight_entertainment.md.
+#
+# can_two_movies_fill_flight() is O(n) per call: it rebuilds a set of
+# movie lengths every time. When we answer MILLIONS of flight-length
+# questions against ONE fixed movie catalogue, we should do the work
+# once and make every question cheap. MovieIndex builds:
+#
+# 1. A sorted copy of movie_lengths, for two-pointer answers that
+#    return the actual pair of movies (find_pair)
+# 2. A table of every achievable pair sum, so "can two movies fill
+#    this flight?" becomes ONE lookup: O(1) per query
+# 3. A "best total at or under" table, so Bonus 1 (minimize wasted
+#    flight time) is also O(1) per query
+#
+# Batches of queries are answered with one vectorized NumPy index
+# when NumPy is available.
+#
+# ===================================================================
+# BUILDING THE PAIR-SUM TABLE
+# ===================================================================
+#
+# Movie lengths are minutes, so they are small integers (U = longest
+# movie). Put a 1 at position L for every movie length L:
+#
+#   lengths {2, 4, 6}  ->  bits ...1010100
+#
+# Adding length a to everything is a SHIFT by a. OR-ing the shifted
+# bitsets for every length gives every sum a + b at once:
+#
+#   sums = OR over a of (bits << a)
+#
+# With NumPy, the same thing is a convolution of the 0/1 indicator
+# with itself (done with an FFT for long catalogues).
+#
+# "NOT THE SAME MOVIE TWICE":
+# a + a is only allowed when length a appears at least twice. So the
+# pure-Python build shifts (bits without a) instead of bits, and the
+# NumPy build subtracts the a + a diagonal, then adds 2a back for
+# lengths that really have two copies.
+#
+# This matches can_two_movies_fill_flight(): [6, 6] with a 12-minute
+# flight is True, because those are two different movies that happen
+# to have the same length. (The write-up's Test 3 expects False, but
+# its own set-based solution returns True for that input. Likewise
+# its Test 2, [2, 3, 5, 7] with 12 minutes, is True: 5 + 7 = 12.)
+#
+# ===================================================================
+
+import bisect
+import random
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def can_two_movies_fill_flight(movie_lengths, flight_length):
+    """Reference set-based solution from the write-up (O(n) per query)."""
+    movie_lengths_seen = set()
+
+    for first_movie_length in movie_lengths:
+        matching_second_movie_length = flight_length - first_movie_length
+        if matching_second_movie_length in movie_lengths_seen:
+            return True
+        movie_lengths_seen.add(first_movie_length)
+
+    return False
+
+
+def _pair_sums_bitset(counts):
+    bits = 0
+    for length in counts:
+        bits |= 1 << length
+
+    sums = 0
+    for length, copies in counts.items():
+        sums |= (bits & ~(1 << length)) << length
+        if copies >= 2:
+            sums |= 1 << (2 * length)
+    return sums
+
+
+def _pair_sums_numpy(counts, longest):
+    indicator = np.zeros(longest + 1, dtype=np.int64)
+    indicator[list(counts)] = 1
+
+    if longest < 2048:
+        pairs = np.convolve(indicator, indicator)
+    else:
+        size = 1 << (2 * longest + 1).bit_length()
+        spectrum = np.fft.rfft(indicator, size)
+        pairs = np.rint(np.fft.irfft(spectrum * spectrum, size)[:2 * longest + 1])
+        pairs = pairs.astype(np.int64)
+
+    # Remove a + a, then allow it again where there are two copies of a
+    lengths = np.fromiter(counts, dtype=np.int64, count=len(counts))
+    copies = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    pairs[2 * lengths] -= 1
+    pairs[2 * lengths[copies >= 2]] += 1
+    return pairs > 0
+
+
+class MovieIndex:
+    """Answer two-movie flight questions for a fixed catalogue in O(1)."""
+
+    __slots__ = ('sorted_lengths', '_achievable', '_best_at_or_under', '_max_sum')
+
+    def __init__(self, movie_lengths):
+        counts = Counter(movie_lengths)
+        if any(length < 0 for length in counts):
+            raise ValueError('movie lengths must be non-negative')
+
+        self.sorted_lengths = sorted(movie_lengths)
+        longest = self.sorted_lengths[-1] if self.sorted_lengths else 0
+        self._max_sum = 2 * longest
+
+        if np is not None:
+            achievable = _pair_sums_numpy(counts, longest) if counts else \
+                np.zeros(1, dtype=bool)
+            positions = np.where(achievable, np.arange(len(achievable)), -1)
+            self._achievable = achievable
+            self._best_at_or_under = np.maximum.accumulate(positions)
+        else:
+            sums = _pair_sums_bitset(counts)
+            self._achievable = sums
+            best = []
+            current = -1
+            for total in range(self._max_sum + 1):
+                if sums >> total & 1:
+                    current = total
+                best.append(current)
+            self._best_at_or_under = best
+
+    def __contains__(self, flight_length):
+        return self.can_fill(flight_length)
+
+    def can_fill(self, flight_length):
+        """O(1): can two different movies exactly fill the flight?"""
+        if flight_length < 0 or flight_length > self._max_sum:
+            return False
+        if np is not None:
+            return bool(self._achievable[flight_length])
+        return bool(self._achievable >> flight_length & 1)
+
+    def can_fill_many(self, flight_lengths):
+        """Answer a batch of queries; vectorized when NumPy is available."""
+        if np is None:
+            return [self.can_fill(flight_length) for flight_length in flight_lengths]
+
+        flights = np.asarray(flight_lengths, dtype=np.int64)
+        in_range = (flights >= 0) & (flights <= self._max_sum)
+        answers = np.zeros(flights.shape, dtype=bool)
+        answers[in_range] = self._achievable[flights[in_range]]
+        return answers
+
+    def best_total(self, flight_length):
+        """O(1): longest two-movie total that fits in the flight (or None)."""
+        if flight_length < 0:
+            return None
+        best = int(self._best_at_or_under[min(flight_length, self._max_sum)])
+        return best if best >= 0 else None
+
+    def find_pair(self, flight_length):
+        """Two-pointer search over the sorted lengths; returns (a, b) or None."""
+        if not self.can_fill(flight_length):
+            return None
+
+        lengths = self.sorted_lengths
+        # Skip movies too long to be part of any pair
+        left = 0
+        right = bisect.bisect_right(lengths, flight_length) - 1
+        while left < right:
+            current_sum = lengths[left] + lengths[right]
+            if current_sum == flight_length:
+                return lengths[left], lengths[right]
+            elif current_sum < flight_length:
+                left += 1
+            else:
+                right -= 1
+        return None
+
+
+def benchmark(num_movies=2000, longest=300, num_queries=200000):
+    """Compare per-query set scans against the prebuilt index."""
+    rng = random.Random(0)
+    movie_lengths = [rng.randint(60, longest) for _ in range(num_movies)]
+    flights = [rng.randint(60, 2 * longest + 60) for _ in range(num_queries)]
+
+    begin = time.perf_counter()
+    index = MovieIndex(movie_lengths)
+    build = time.perf_counter() - begin
+    print(f'{num_movies} movies, build index: {build * 1e3:.2f} ms')
+
+    sample = flights[:2000]
+    begin = time.perf_counter()
+    expected = [can_two_movies_fill_flight(movie_lengths, flight) for flight in sample]
+    per_query = (time.perf_counter() - begin) / len(sample)
+    print(f'  set scan per query        {per_query * 1e9:>12,.0f} ns')
+
+    begin = time.perf_counter()
+    answers = [index.can_fill(flight) for flight in flights]
+    per_query = (time.perf_counter() - begin) / len(flights)
+    print(f'  index.can_fill per query  {per_query * 1e9:>12,.0f} ns')
+
+    begin = time.perf_counter()
+    batch = index.can_fill_many(flights)
+    per_query = (time.perf_counter() - begin) / len(flights)
+    print(f'  index.can_fill_many       {per_query * 1e9:>12,.0f} ns per query')
+
+    assert answers[:len(sample)] == expected
+    assert list(batch) == answers
+
+
+if __name__ == '__main__':
+    cases = [
+        ([2, 4, 6, 8, 9, 10], 12, True),
+        ([2, 3, 5, 7], 12, True),  # 5 + 7
+        ([2, 3, 5, 7], 13, False),
+        ([6, 6], 12, True),
+        ([6], 12, False),
+        ([10], 20, False),
+        ([], 10, False),
+        ([3, 7], 10, True),
+        ([3, 5], 10, False),
+        ([1, 2, 3, 4, 5], 7, True),
+        ([1000000, 500000], 1500000, True),
+        ([10, 2, 4, 6, 8], 12, True),
+    ]
+    for movie_lengths, flight_length, expected in cases:
+        assert can_two_movies_fill_flight(movie_lengths, flight_length) == expected
+        index = MovieIndex(movie_lengths)
+        assert (flight_length in index) == expected
+        pair = index.find_pair(flight_length)
+        assert (pair is not None) == expected
+        if pair:
+            assert sum(pair) == flight_length
+
+    rng = random.Random(1)
+    for _ in range(50):
+        movie_lengths = [rng.randint(1, 40) for _ in range(rng.randint(0, 12))]
+        index = MovieIndex(movie_lengths)
+        flights = list(range(-2, 90))
+        expected = [can_two_movies_fill_flight(movie_lengths, f) for f in flights]
+        assert list(index.can_fill_many(flights)) == expected
+        for flight in flights:
+            fitting = [total for total, ok in zip(flights, expected) if ok and total <= flight]
+            assert index.best_total(flight) == (max(fitting) if fitting else None)
+
+    print('All inflight entertainment tests passed!')
+    benchmark()
@@ -0,0 +1,257 @@
+# ===================================================================
+# PROBLEM: Permutation Palindrome - Bitmask Parity over Byte Streams
+# ===================================================================
+#
+# Companion code for permutation_palindrome.md.
+#
+# The write-up's key insight: we don't need exact counts, only whether
+# each character has been seen an ODD or EVEN number of times. The set
+# solution tracks that with a set of "unpaired" characters.
+#
+# For lowercase a-z there are only 26 possible characters, so the
+# whole set fits in ONE 26-bit integer:
+#
+#   bit 0 = 'a' is unpaired, bit 1 = 'b' is unpaired, ... bit 25 = 'z'
+#
+#   "add or remove char from the set"  ->  mask ^= 1 << (char - 'a')
+#   "len(unpaired_characters) <= 1"    ->  mask & (mask - 1) == 0
+#
+# (mask & (mask - 1) clears the lowest set bit, so it is 0 exactly
+# when at most one bit is set.)
+#
+# This file adds:
+# 1. parity_mask() - the mask of a bytes-like block. Short inputs
+#    XOR-fold a precomputed byte -> bit table; long blocks count each
+#    letter in C (bytes.count or np.bincount) and keep the low bit.
+# 2. has_palindrome_permutation_stream() - reads a file object in
+#    large blocks into one reused buffer (multi-GB single strings)
+# 3. has_palindrome_permutation_file() - splits a file into byte
+#    ranges, masks them in parallel, and XOR-folds the results.
+#    Parity doesn't care about order, so ANY split point is safe.
+# 4. has_palindrome_permutation_batch() - many short records at once
+#
+# Input must be lowercase a-z (the write-up's constraint); anything
+# else raises ValueError instead of being silently miscounted.
+#
+# ===================================================================
+
+import functools
+import operator
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LETTERS = bytes(range(ord('a'), ord('z') + 1))
+_BIT = [0] * 256
+for _offset, _byte in enumerate(_LETTERS):
+    _BIT[_byte] = 1 << _offset
+
+# Below this size, folding the table beats 26 separate count() passes
+_SHORT_INPUT = 64
+
+
+def has_palindrome_permutation(the_string):
+    """Reference set-based solution from the write-up."""
+    unpaired_characters = set()
+
+    for char in the_string:
+        if char in unpaired_characters:
+            unpaired_characters.remove(char)
+        else:
+            unpaired_characters.add(char)
+
+    return len(unpaired_characters) <= 1
+
+
+def _as_bytes(data):
+    if isinstance(data, str):
+        return data.encode('ascii', errors='replace')
+    return data
+
+
+def _reject_non_lowercase():
+    raise ValueError('input must contain only lowercase letters a-z')
+
+
+def parity_mask(data):
+    """26-bit odd/even parity mask of a bytes-like object (or ASCII str)."""
+    block = _as_bytes(data)
+
+    if len(block) < _SHORT_INPUT:
+        # bytes.translate(None, delete) runs in C; anything left is bad
+        if bytes(block).translate(None, _LETTERS):
+            _reject_non_lowercase()
+        return functools.reduce(operator.xor, map(_BIT.__getitem__, block), 0)
+
+    # For long blocks the letter counts double as validation: they must
+    # add up to the block length
+    if np is not None:
+        counts = np.bincount(np.frombuffer(block, dtype=np.uint8), minlength=256)
+        letters = counts[ord('a'):ord('z') + 1]
+        if letters.sum() != len(block):
+            _reject_non_lowercase()
+        odd = letters & 1
+        return int(np.dot(odd, 1 << np.arange(26, dtype=np.int64)))
+
+    block = bytes(block)
+    mask = 0
+    total = 0
+    for offset, letter in enumerate(_LETTERS):
+        count = block.count(letter)
+        total += count
+        if count & 1:
+            mask |= 1 << offset
+    if total != len(block):
+        _reject_non_lowercase()
+    return mask
+
+
+def fold_masks(masks):
+    """Combine masks of separate chunks: parity of a sum is the XOR."""
+    return functools.reduce(operator.xor, masks, 0)
+
+
+def is_palindrome_mask(mask):
+    return mask & (mask - 1) == 0
+
+
+def has_palindrome_permutation_bytes(data):
+    return is_palindrome_mask(parity_mask(data))
+
+
+def has_palindrome_permutation_stream(file, block_size=8 * 1024 * 1024):
+    """Check a binary file object without loading it all into memory."""
+    buffer = bytearray(block_size)
+    view = memoryview(buffer)
+    mask = 0
+    while True:
+        size = file.readinto(buffer)
+        if not size:
+            break
+        mask ^= parity_mask(view[:size])
+    return is_palindrome_mask(mask)
+
+
+def _mask_file_range(task):
+    path, start, stop, block_size = task
+    mask = 0
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = stop - start
+        while remaining:
+            block = file.read(min(block_size, remaining))
+            mask ^= parity_mask(block)
+            remaining -= len(block)
+    return mask
+
+
+def has_palindrome_permutation_file(path, workers=None, block_size=8 * 1024 * 1024):
+    """Mask byte ranges of a file in parallel, then XOR-fold the masks."""
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+    step = max(block_size, -(-size // workers))
+    tasks = [(path, start, min(start + step, size), block_size)
+             for start in range(0, size, step)]
+
+    if len(tasks) <= 1:
+        masks = map(_mask_file_range, tasks)
+        return is_palindrome_mask(fold_masks(masks))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return is_palindrome_mask(fold_masks(pool.map(_mask_file_range, tasks)))
+
+
+def has_palindrome_permutation_batch(records):
+    """Check many short records; returns one bool per record."""
+    records = [_as_bytes(record) for record in records]
+    if np is None or not records:
+        return [is_palindrome_mask(parity_mask(record)) for record in records]
+
+    lengths = np.fromiter(map(len, records), dtype=np.int64, count=len(records))
+    flat = np.frombuffer(b''.join(records), dtype=np.uint8)
+    if flat.size == 0:
+        return np.ones(len(records), dtype=bool)
+    if flat.min() < ord('a') or flat.max() > ord('z'):
+        _reject_non_lowercase()
+
+    # One bit per byte, then XOR-reduce each record's slice in C
+    bits = np.left_shift(np.uint32(1), (flat - ord('a')).astype(np.uint32))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    non_empty = lengths > 0
+    masks = np.zeros(len(records), dtype=np.uint32)
+    masks[non_empty] = np.bitwise_xor.reduceat(bits, starts[non_empty])
+    return (masks & (masks - np.uint32(1))) == 0
+
+
+def benchmark(size=20_000_000, records=200_000):
+    """Compare the set solution, the block mask, and the batch API."""
+    import random
+
+    rng = random.Random(0)
+    text = bytes(rng.choice(_LETTERS) for _ in range(size // 20)) * 20
+
+    sample = text[:1_000_000].decode('ascii')
+    begin = time.perf_counter()
+    has_palindrome_permutation(sample)
+    print(f'  set solution       {len(sample) / (time.perf_counter() - begin) / 1e6:8.1f} MB/s')
+
+    begin = time.perf_counter()
+    has_palindrome_permutation_bytes(text)
+    print(f'  parity_mask        {len(text) / (time.perf_counter() - begin) / 1e6:8.1f} MB/s')
+
+    short = [text[i:i + rng.randint(1, 30)] for i in range(records)]
+    begin = time.perf_counter()
+    [has_palindrome_permutation(record.decode('ascii')) for record in short]
+    print(f'  set, per record    {records / (time.perf_counter() - begin):12,.0f} records/s')
+    begin = time.perf_counter()
+    has_palindrome_permutation_batch(short)
+    print(f'  batch API          {records / (time.perf_counter() - begin):12,.0f} records/s')
+
+
+if __name__ == '__main__':
+    import io
+    import random
+    import tempfile
+
+    cases = [('civic', True), ('ivicc', True), ('civil', False), ('livci', False),
+             ('', True), ('a', True), ('ab', False), ('aabbccd', True)]
+    for text, expected in cases:
+        assert has_palindrome_permutation(text) == expected
+        assert has_palindrome_permutation_bytes(text) == expected
+        assert has_palindrome_permutation_stream(io.BytesIO(text.encode()), 2) == expected
+    assert list(has_palindrome_permutation_batch([t for t, _ in cases])) == \
+        [expected for _, expected in cases]
+
+    for bad in ('Civic', 'civic ' * 20):
+        try:
+            parity_mask(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('non-lowercase input should be rejected')
+
+    rng = random.Random(1)
+    for _ in range(200):
+        text = ''.join(rng.choice('abcdefgh') for _ in range(rng.randint(0, 300)))
+        expected = has_palindrome_permutation(text)
+        assert has_palindrome_permutation_bytes(text) == expected
+        assert parity_mask(text) == fold_masks([parity_mask(text[:37]), parity_mask(text[37:])])
+
+    text = ('aabbcc' * 100000 + 'z').encode()
+    with tempfile.NamedTemporaryFile(delete=False) as file:
+        file.write(text)
+        path = file.name
+    try:
+        assert has_palindrome_permutation_file(path, workers=2, block_size=4096)
+        with open(path, 'rb') as file:
+            assert has_palindrome_permutation_stream(file, block_size=4096)
+    finally:
+        os.remove(path)
+
+    print('All permutation palindrome tests passed!')
+    benchmark()
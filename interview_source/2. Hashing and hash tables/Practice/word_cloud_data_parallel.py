@@ -0,0 +1,250 @@
+# ===================================================================
+# PROBLEM: Word Cloud Data - Parallel Map-Reduce Builder
+# ===================================================================
+#
+# Companion code for word_cloud_data.md.
+#
+# The write-up builds the word cloud from ONE string in ONE process.
+# For multi-GB corpora we want every core working, without ever
+# loading the whole file into memory. This file adds:
+#
+# 1. iter_words() - the documented tokenization rules, written as a
+#    single index-tracking pass (no per-character string +=)
+# 2. count_words() - a local counting table for one chunk of text
+# 3. build_word_cloud() - the single-string version, for comparison
+# 4. build_word_cloud_from_file() - the map-reduce pipeline:
+#      MAP:    mmap the file, cut it into chunks at whitespace, and
+#              count each chunk in a worker process
+#      REDUCE: merge the partial tables in chunk order
+#
+# ===================================================================
+# TOKENIZATION RULES (from the write-up)
+# ===================================================================
+#
+# - Letters belong to words ("123abc" -> "abc")
+# - A hyphen BETWEEN two letters belongs to the word ("Mille-Feuille")
+# - An apostrophe BETWEEN two letters belongs to the word ("don't")
+# - ...except a possessive "'s" at the end splits off ("Bill's" ->
+#   "Bill", "s"), matching the write-up's examples
+# - Everything else separates words: spaces, commas, periods,
+#   ellipses, em dashes, parentheses, digits, stray hyphens
+#
+# CAPITALIZATION: "Only uppercase if ALWAYS uppercase" (Option 3)
+# A word is reported with a capital letter only if EVERY occurrence
+# starts with one ("Dana"). One lowercase sighting ("the") wins.
+#
+# To make that rule work across chunks, each table stores, per
+# lowercased word:
+#   [count, spelling]
+# where spelling is the first capitalized spelling seen, or None once
+# any lowercase occurrence has been seen. Merging two tables adds the
+# counts and keeps None if either side saw lowercase - so the merge is
+# associative and chunks can be counted in any process.
+#
+# ===================================================================
+# WHY CUTTING AT WHITESPACE IS SAFE
+# ===================================================================
+#
+# A word (including its hyphens and apostrophes) never contains
+# whitespace, so a cut just after a whitespace byte can't split one.
+# Whitespace bytes are ASCII, so the cut also never lands inside a
+# multi-byte UTF-8 character like the em dash.
+#
+# ===================================================================
+
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+_WHITESPACE = b' \t\n\r\f\v'
+
+
+def iter_words(text):
+    """Yield the words in text, following the write-up's rules."""
+    length = len(text)
+    i = 0
+    while i < length:
+        if not text[i].isalpha():
+            i += 1
+            continue
+
+        start = i
+        i += 1
+        while i < length:
+            character = text[i]
+            if character.isalpha():
+                i += 1
+            elif (character == '-' or character == "'") and \
+                    i + 1 < length and text[i + 1].isalpha():
+                i += 2
+            else:
+                break
+
+        # Slice once per word, not once per character
+        word = text[start:i]
+        if word.endswith("'s") and len(word) > 2:
+            yield word[:-2]
+            yield 's'
+        else:
+            yield word
+
+
+def count_words(words, table=None):
+    """Count words into a {lowercase: [count, spelling]} table."""
+    if table is None:
+        table = {}
+    for word in words:
+        key = word.lower()
+        entry = table.get(key)
+        capitalized = word[0].isupper()
+        if entry is None:
+            table[key] = [1, word if capitalized else None]
+        else:
+            entry[0] += 1
+            if not capitalized:
+                entry[1] = None
+    return table
+
+
+def merge_counts(into, other):
+    """Fold table other into table into (other must come later in the text)."""
+    for key, (count, spelling) in other.items():
+        entry = into.get(key)
+        if entry is None:
+            into[key] = [count, spelling]
+        else:
+            entry[0] += count
+            if spelling is None:
+                entry[1] = None
+    return into
+
+
+def finalize_counts(table, keep_proper_nouns=True):
+    """Turn a counting table into the {word: count} word cloud dict."""
+    words_to_counts = {}
+    for key, (count, spelling) in table.items():
+        if keep_proper_nouns and spelling is not None:
+            words_to_counts[spelling] = count
+        else:
+            words_to_counts[key] = count
+    return words_to_counts
+
+
+def build_word_cloud(input_string, keep_proper_nouns=True):
+    """Single-process word cloud for one string."""
+    return finalize_counts(count_words(iter_words(input_string)), keep_proper_nouns)
+
+
+def chunk_boundaries(buffer, chunk_size):
+    """Split buffer into [(start, stop), ...] cut just after whitespace."""
+    size = len(buffer)
+    boundaries = []
+    start = 0
+    while start < size:
+        stop = min(start + chunk_size, size)
+        # Walk forward to the next whitespace byte (or end of buffer)
+        while stop < size and buffer[stop] not in _WHITESPACE:
+            stop += 1
+        boundaries.append((start, stop))
+        start = stop
+    return boundaries
+
+
+def _count_file_chunk(task):
+    path, start, stop = task
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            text = buffer[start:stop].decode('utf-8')
+    return count_words(iter_words(text))
+
+
+def build_word_cloud_from_file(path, workers=None, chunk_size=16 * 1024 * 1024,
+                               keep_proper_nouns=True):
+    """Map-reduce word cloud over a UTF-8 text file.
+
+    Only one chunk per worker is decoded at a time, so memory stays at
+    roughly workers * chunk_size plus the counting tables.
+    """
+    if os.path.getsize(path) == 0:
+        return {}
+
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            tasks = [(path, start, stop)
+                     for start, stop in chunk_boundaries(buffer, chunk_size)]
+
+    table = {}
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            merge_counts(table, _count_file_chunk(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields results in chunk order, which keeps the
+            # "first capitalized spelling" rule deterministic
+            for partial in pool.map(_count_file_chunk, tasks):
+                merge_counts(table, partial)
+
+    return finalize_counts(table, keep_proper_nouns)
+
+
+def benchmark(path, chunk_size=4 * 1024 * 1024):
+    """Time the pipeline with 1, 2, 4... workers up to the core count."""
+    size_mb = os.path.getsize(path) / 1e6
+    workers = 1
+    while True:
+        begin = time.perf_counter()
+        build_word_cloud_from_file(path, workers=workers, chunk_size=chunk_size)
+        elapsed = time.perf_counter() - begin
+        print(f'  {workers:>3} worker(s): {elapsed:8.3f} s  ({size_mb / elapsed:7.1f} MB/s)')
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(workers * 2, os.cpu_count() or 1)
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    cloud = build_word_cloud
+    assert cloud('We came, we saw, we conquered') == \
+        {'we': 3, 'came': 1, 'saw': 1, 'conquered': 1}
+    assert cloud('The the THE') == {'the': 3}
+    assert cloud('well-known fact') == {'well-known': 1, 'fact': 1}
+    assert cloud("don't can't") == {"don't": 1, "can't": 1}
+    assert cloud('hello—world') == {'hello': 1, 'world': 1}
+    assert cloud('wait...go') == {'wait': 1, 'go': 1}
+    assert cloud("Bill's cake", keep_proper_nouns=False) == {'bill': 1, 's': 1, 'cake': 1}
+    assert cloud('hello    world') == {'hello': 1, 'world': 1}
+    assert cloud('...hello!!!') == {'hello': 1}
+    assert cloud('') == {}
+    assert cloud('...!!!???') == {}
+    assert cloud('123abc') == {'abc': 1}
+    assert cloud('hello- -world') == {'hello': 1, 'world': 1}
+    assert cloud('Bill and bill are here') == {'bill': 2, 'and': 1, 'are': 1, 'here': 1}
+    complex_cloud = cloud("We came, we saw, we conquered...then we ate "
+                          "Bill's (Mille-Feuille) cake.")
+    assert complex_cloud['we'] == 4
+    assert complex_cloud['Mille-Feuille'] == 1
+    assert complex_cloud['Bill'] == 1
+    assert cloud('After beating the eggs, Dana read the next step: '
+                 'Add milk and eggs, then add flour and sugar.')['Dana'] == 1
+
+    # Tiny chunks force many cuts; the result must not change
+    sample = ("The bill came to five dollars. The bill was paid by Bill. "
+              "Mille-Feuille—don't stop... ") * 500
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.txt',
+                                     delete=False) as file:
+        file.write(sample)
+        path = file.name
+    try:
+        expected = build_word_cloud(sample)
+        assert build_word_cloud_from_file(path, workers=1, chunk_size=7) == expected
+        assert build_word_cloud_from_file(path, workers=2, chunk_size=1000) == expected
+        print('All word cloud tests passed!')
+
+        with open(path, 'w', encoding='utf-8') as file:
+            for _ in range(40):
+                file.write(sample)
+        benchmark(path, chunk_size=256 * 1024)
+    finally:
+        os.remove(path)
@@ -0,0 +1,280 @@
+# ===================================================================
+# PROBLEM: Apple Stocks - Streaming, Batch and Rolling-Window Profit
+# ===================================================================
+#
+# Companion code for apple_stocks.md.
+#
+# get_max_profit() walks a Python list once, tracking the minimum
+# price so far. For full-day tick series across thousands of symbols
+# we need three more shapes of the same greedy idea:
+#
+# 1. MaxProfitTracker - consumes ticks one at a time with O(1) state
+#    (min price, best profit) and can report the best profit SO FAR
+#    at any moment, e.g. while the market is still open.
+# 2. get_max_profit_batch() - a 2-D (symbols x minutes) array in one
+#    vectorized pass:
+#        running_min = np.minimum.accumulate(prices[:, :-1], axis=1)
+#        profit      = prices[:, 1:] - running_min
+#    Row i, column j of profit is "sell at minute j + 1, having bought
+#    at the cheapest minute before it" - exactly the greedy step.
+# 3. RollingMaxProfit - the best trade whose buy AND sell both fall in
+#    the last W minutes, updated in amortized O(1) per tick.
+#
+# ===================================================================
+# THE ROLLING WINDOW
+# ===================================================================
+#
+# A plain sliding-window minimum (monotonic deque) only answers "what
+# is the best buy for selling RIGHT NOW?". When the oldest minute
+# leaves the window, the best trade may have been buying at it, and a
+# min-deque can't tell us the next-best trade.
+#
+# Instead, every stretch of prices is summarized by three numbers:
+#
+#   (lowest, highest, best_trade)
+#
+# and two stretches, left then right, combine as:
+#
+#   lowest     = min(left.lowest, right.lowest)
+#   highest    = max(left.highest, right.highest)
+#   best_trade = max(left.best, right.best,
+#                    right.highest - left.lowest)   # buy left, sell right
+#
+# The window is a queue built from two stacks of running summaries
+# (the "two-stack queue"): push to the back stack, pop from the front
+# stack, and refill the front stack in reverse when it runs dry. Each
+# price is moved at most once, so every tick is amortized O(1).
+#
+# ===================================================================
+
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_NO_TRADE = None
+
+
+def get_max_profit(stock_prices):
+    """Reference one-pass greedy solution from the write-up."""
+    if len(stock_prices) < 2:
+        raise ValueError('Getting a profit requires at least 2 prices')
+
+    min_price = stock_prices[0]
+    max_profit = stock_prices[1] - stock_prices[0]
+
+    for current_price in stock_prices[1:]:
+        potential_profit = current_price - min_price
+        max_profit = max(max_profit, potential_profit)
+        min_price = min(min_price, current_price)
+
+    return max_profit
+
+
+class MaxProfitTracker:
+    """O(1)-state greedy max profit over a live stream of prices."""
+
+    __slots__ = ('min_price', 'max_profit', 'ticks')
+
+    def __init__(self):
+        self.min_price = None
+        self.max_profit = _NO_TRADE
+        self.ticks = 0
+
+    def update(self, price):
+        """Feed one price; returns the best profit so far (None before 2 ticks)."""
+        self.ticks += 1
+        if self.min_price is None:
+            self.min_price = price
+            return self.max_profit
+
+        potential_profit = price - self.min_price
+        if self.max_profit is None or potential_profit > self.max_profit:
+            self.max_profit = potential_profit
+        if price < self.min_price:
+            self.min_price = price
+        return self.max_profit
+
+    def feed(self, prices):
+        """Yield the best profit so far after every price in the stream."""
+        for price in prices:
+            yield self.update(price)
+
+
+def get_max_profit_stream(prices):
+    """get_max_profit() for any iterator of prices, without storing them."""
+    tracker = MaxProfitTracker()
+    for price in prices:
+        tracker.update(price)
+    if tracker.ticks < 2:
+        raise ValueError('Getting a profit requires at least 2 prices')
+    return tracker.max_profit
+
+
+def get_max_profit_batch(prices):
+    """Best single trade for every row of a (symbols x minutes) array."""
+    if np is None:
+        return [get_max_profit(row) for row in prices]
+
+    prices = np.asarray(prices)
+    if prices.ndim != 2 or prices.shape[1] < 2:
+        raise ValueError('Getting a profit requires at least 2 prices per symbol')
+
+    running_min = np.minimum.accumulate(prices[:, :-1], axis=1)
+    return (prices[:, 1:] - running_min).max(axis=1)
+
+
+def _combine(left, right):
+    return (min(left[0], right[0]),
+            max(left[1], right[1]),
+            max(left[2], right[2], right[1] - left[0]))
+
+
+class RollingMaxProfit:
+    """Best trade with buy and sell inside the last `window` ticks."""
+
+    __slots__ = ('window', '_front', '_back', '_back_summary', '_size')
+
+    def __init__(self, window):
+        if window < 2:
+            raise ValueError('a trade needs a window of at least 2 ticks')
+        self.window = window
+        # _front holds (price, summary of this price..end of front stack);
+        # its top is the OLDEST price in the window
+        self._front = []
+        # _back holds raw prices, newest last, summarized by _back_summary
+        self._back = []
+        self._back_summary = None
+        self._size = 0
+
+    def _pop_oldest(self):
+        if not self._front:
+            summary = None
+            while self._back:
+                price = self._back.pop()
+                single = (price, price, float('-inf'))
+                summary = single if summary is None else _combine(single, summary)
+                self._front.append((price, summary))
+            self._back_summary = None
+        self._front.pop()
+        self._size -= 1
+
+    def update(self, price):
+        """Add one tick; returns the best trade in the window (None if < 2 ticks)."""
+        single = (price, price, float('-inf'))
+        self._back.append(price)
+        self._back_summary = single if self._back_summary is None \
+            else _combine(self._back_summary, single)
+        self._size += 1
+        if self._size > self.window:
+            self._pop_oldest()
+
+        if self._size < 2:
+            return _NO_TRADE
+        if not self._front:
+            return self._back_summary[2]
+        front_summary = self._front[-1][1]
+        if self._back_summary is None:
+            return front_summary[2]
+        return _combine(front_summary, self._back_summary)[2]
+
+    def feed(self, prices):
+        for price in prices:
+            yield self.update(price)
+
+
+def rolling_max_profit_brute(prices, window):
+    """O(n * W²) reference for RollingMaxProfit."""
+    results = []
+    for end in range(len(prices)):
+        start = max(0, end - window + 1)
+        best = _NO_TRADE
+        for buy in range(start, end + 1):
+            for sell in range(buy + 1, end + 1):
+                profit = prices[sell] - prices[buy]
+                if best is None or profit > best:
+                    best = profit
+        results.append(best)
+    return results
+
+
+def benchmark(symbols=3000, minutes=390):
+    """Compare per-symbol Python loops against the vectorized batch."""
+    rng = random.Random(0)
+    rows = []
+    for _ in range(symbols):
+        price = 100.0
+        row = []
+        for _ in range(minutes):
+            price += rng.gauss(0, 0.5)
+            row.append(price)
+        rows.append(row)
+
+    begin = time.perf_counter()
+    expected = [get_max_profit(row) for row in rows]
+    loop = time.perf_counter() - begin
+    print(f'{symbols} symbols x {minutes} minutes')
+    print(f'  get_max_profit per symbol   {symbols / loop:>12,.0f} symbols/s')
+
+    begin = time.perf_counter()
+    for row in rows:
+        get_max_profit_stream(iter(row))
+    stream = time.perf_counter() - begin
+    print(f'  MaxProfitTracker stream     {symbols / stream:>12,.0f} symbols/s')
+
+    if np is not None:
+        array = np.array(rows)
+        begin = time.perf_counter()
+        batch = get_max_profit_batch(array)
+        vectorized = time.perf_counter() - begin
+        print(f'  get_max_profit_batch        {symbols / vectorized:>12,.0f} symbols/s')
+        assert np.allclose(batch, expected)
+
+    begin = time.perf_counter()
+    list(RollingMaxProfit(30).feed(rows[0] * 100))
+    rolling = time.perf_counter() - begin
+    print(f'  RollingMaxProfit(30)        {minutes * 100 / rolling:>12,.0f} ticks/s')
+
+
+if __name__ == '__main__':
+    cases = [
+        ([10, 7, 5, 8, 11, 9], 6),
+        ([9, 7, 4, 1], -2),
+        ([3, 5], 2),
+        ([1, 2, 3, 4, 5], 4),
+        ([5, 5, 5, 5], 0),
+        ([10, 1, 10], 9),
+        ([5, 10, 1], 5),
+        ([3, 1, 4, 1, 5, 9, 2, 6], 8),
+        ([5, 2, 1], -1),
+        ([1, 100], 99),
+        ([10, 1], -9),
+    ]
+    for prices, expected in cases:
+        assert get_max_profit(prices) == expected
+        assert get_max_profit_stream(iter(prices)) == expected
+        assert list(get_max_profit_batch([prices]))[0] == expected
+
+    for bad in ([], [5]):
+        for function in (get_max_profit, get_max_profit_stream):
+            try:
+                function(bad)
+                assert False, 'Should raise error'
+            except ValueError:
+                pass
+
+    tracker = MaxProfitTracker()
+    assert list(tracker.feed([10, 7, 5, 8, 11, 9])) == [None, -3, -2, 3, 6, 6]
+
+    rng = random.Random(1)
+    for _ in range(100):
+        prices = [rng.randint(1, 50) for _ in range(rng.randint(0, 40))]
+        window = rng.randint(2, 10)
+        assert list(RollingMaxProfit(window).feed(prices)) == \
+            rolling_max_profit_brute(prices, window)
+
+    print('All apple stocks tests passed!')
+    benchmark()
@@ -0,0 +1,245 @@
+# ===================================================================
+# PROBLEM: Highest Product of K - Batch, Streaming and Any k
+# ===================================================================
+#
+# Companion code for highest_product_of_3.md (see the "product of 4,
+# product of k" bonus).
+#
+# The greedy solution tracks highest, lowest, highest_product_of_2 and
+# lowest_product_of_2 in one pass. That bookkeeping grows with k, and
+# it's a Python loop over every element. This file adds:
+#
+# 1. highest_product_of_k() - any k, with correct sign handling
+# 2. A NumPy path that finds the extremes with np.partition
+#    (introselect, O(n), no full sort)
+# 3. ProductState - mergeable partial state for streaming: fold chunks
+#    of an iterator (or results from other workers) into it, then ask
+#    for the answer at the end
+# 4. benchmark() - greedy vs sort vs heapq vs NumPy
+#
+# ===================================================================
+# WHY ONLY THE k SMALLEST AND k LARGEST MATTER
+# ===================================================================
+#
+# Sort the numbers. Some best choice of k numbers is always the i
+# SMALLEST together with the (k - i) LARGEST, for some i in 0..k:
+#
+#   [-10, -10, 1, 3, 2], k = 3
+#   sorted: [-10, -10, 1, 2, 3]
+#   i = 0:  1 * 2 * 3         =   6
+#   i = 1:  -10 * 2 * 3       = -60
+#   i = 2:  -10 * -10 * 3     = 300   <- best
+#   i = 3:  -10 * -10 * 1     = 100
+#
+# Big negative numbers are useful in PAIRS (their product is a big
+# positive), and they live at the small end; big positives live at
+# the large end. When every choice is negative (all negatives, odd k),
+# the "least bad" product takes the numbers closest to zero - the
+# largest ones, i = 0. Either way the pick is a prefix plus a suffix.
+#
+# So we only need the k smallest and k largest values - at most 2k
+# numbers, no matter how big the input is - and k + 1 candidate
+# products. Products are computed with Python ints, so they never
+# overflow even when the inputs are NumPy int64.
+#
+# ===================================================================
+
+import heapq
+import random
+import time
+from math import prod
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def highest_product_of_3(list_of_ints):
+    """Reference greedy solution from the write-up."""
+    if len(list_of_ints) < 3:
+        raise ValueError('Need at least 3 integers')
+
+    highest = max(list_of_ints[0], list_of_ints[1])
+    lowest = min(list_of_ints[0], list_of_ints[1])
+    highest_product_of_2 = list_of_ints[0] * list_of_ints[1]
+    lowest_product_of_2 = list_of_ints[0] * list_of_ints[1]
+    highest_product_of_3 = list_of_ints[0] * list_of_ints[1] * list_of_ints[2]
+
+    for i in range(2, len(list_of_ints)):
+        current = list_of_ints[i]
+        highest_product_of_3 = max(highest_product_of_3,
+                                   current * highest_product_of_2,
+                                   current * lowest_product_of_2)
+        highest_product_of_2 = max(highest_product_of_2,
+                                   current * highest,
+                                   current * lowest)
+        lowest_product_of_2 = min(lowest_product_of_2,
+                                  current * highest,
+                                  current * lowest)
+        highest = max(highest, current)
+        lowest = min(lowest, current)
+
+    return highest_product_of_3
+
+
+def highest_product_of_k_sorted(list_of_ints, k):
+    """O(n log n) sort-based version, for comparison."""
+    if len(list_of_ints) < k:
+        raise ValueError(f'Need at least {k} integers')
+    return _best_from_sorted_extremes(sorted(list_of_ints), k)
+
+
+def _best_from_sorted_extremes(extremes, k):
+    # extremes is sorted and holds the k smallest and k largest values
+    size = len(extremes)
+    return max(prod(extremes[:i]) * prod(extremes[size - (k - i):])
+               for i in range(k + 1))
+
+
+def _chunk_extremes(chunk, k):
+    """The k smallest and k largest values of one chunk, as Python ints."""
+    if np is not None and isinstance(chunk, np.ndarray):
+        size = len(chunk)
+        if size <= 2 * k:
+            return chunk.tolist()
+        parted = np.partition(chunk, (k - 1, size - k))
+        return parted[:k].tolist() + parted[size - k:].tolist()
+
+    chunk = list(chunk)
+    if len(chunk) <= 2 * k:
+        return chunk
+    return heapq.nsmallest(k, chunk) + heapq.nlargest(k, chunk)
+
+
+class ProductState:
+    """Mergeable partial state for highest_product_of_k over a stream."""
+
+    __slots__ = ('k', 'count', '_extremes')
+
+    def __init__(self, k):
+        if k < 1:
+            raise ValueError('k must be at least 1')
+        self.k = k
+        self.count = 0
+        # Sorted; all values seen, or the k smallest + k largest of them
+        self._extremes = []
+
+    def _keep(self, values):
+        values.sort()
+        if len(values) > 2 * self.k:
+            values = values[:self.k] + values[-self.k:]
+        self._extremes = values
+
+    def add_chunk(self, chunk):
+        """Fold one chunk (list, iterator or NumPy array) into the state."""
+        if np is None or not isinstance(chunk, np.ndarray):
+            chunk = list(chunk)
+        self.count += len(chunk)
+        self._keep(self._extremes + _chunk_extremes(chunk, self.k))
+        return self
+
+    def merge(self, other):
+        """Combine with the state of a different part of the input."""
+        if other.k != self.k:
+            raise ValueError('cannot merge states for different k')
+        self.count += other.count
+        self._keep(self._extremes + other._extremes)
+        return self
+
+    def result(self):
+        if self.count < self.k:
+            raise ValueError(f'Need at least {self.k} integers')
+        return _best_from_sorted_extremes(self._extremes, self.k)
+
+
+def highest_product_of_k(ints, k=3):
+    """Highest product of any k of the ints (list or NumPy array), O(n)."""
+    return ProductState(k).add_chunk(ints).result()
+
+
+def highest_product_of_k_stream(ints, k=3, chunk_size=65536):
+    """highest_product_of_k() for an iterator, reading chunk_size at a time."""
+    state = ProductState(k)
+    chunk = []
+    for value in ints:
+        chunk.append(value)
+        if len(chunk) == chunk_size:
+            state.add_chunk(chunk)
+            chunk = []
+    if chunk:
+        state.add_chunk(chunk)
+    return state.result()
+
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000), k=3):
+    rng = random.Random(0)
+    print(f'{"n":>10} {"greedy":>10} {"sorted":>10} {"heapq":>10} {"numpy":>10}  (seconds)')
+    for n in sizes:
+        values = [rng.randint(-1000, 1000) for _ in range(n)]
+        timings = []
+        runs = [lambda: highest_product_of_3(values),
+                lambda: highest_product_of_k_sorted(values, k),
+                lambda: highest_product_of_k(values, k)]
+        if np is not None:
+            array = np.array(values, dtype=np.int64)
+            runs.append(lambda: highest_product_of_k(array, k))
+
+        answers = set()
+        for run in runs:
+            begin = time.perf_counter()
+            answers.add(run())
+            timings.append(time.perf_counter() - begin)
+        assert len(answers) == 1
+
+        print(f'{n:>10} ' + ' '.join(f'{timing:>10.4f}' for timing in timings))
+
+
+if __name__ == '__main__':
+    from itertools import combinations
+
+    cases = [
+        ([1, 10, 2, 3, 4], 120),
+        ([-10, -10, 1, 3, 2], 300),
+        ([-5, -3, -1], -15),
+        ([1, 2, 3], 6),
+        ([0, 1, 2, 3], 6),
+        ([-5, -4, 0, 1, 100], 2000),
+        ([5, 5, 5], 125),
+        ([-5, -5, -5], -125),
+        ([1, -5, -10, 0, 5, 20], 1000),
+    ]
+    for ints, expected in cases:
+        assert highest_product_of_3(ints) == expected
+        assert highest_product_of_k(ints) == expected
+        assert highest_product_of_k_sorted(ints, 3) == expected
+        assert highest_product_of_k_stream(iter(ints), chunk_size=2) == expected
+        if np is not None:
+            assert highest_product_of_k(np.array(ints)) == expected
+
+    try:
+        highest_product_of_k([1, 2])
+        assert False, 'Should raise error'
+    except ValueError:
+        pass
+
+    rng = random.Random(1)
+    for _ in range(300):
+        ints = [rng.randint(-9, 9) for _ in range(rng.randint(1, 9))]
+        k = rng.randint(1, len(ints))
+        expected = max(prod(choice) for choice in combinations(ints, k))
+        assert highest_product_of_k(ints, k) == expected, (ints, k)
+        assert highest_product_of_k_stream(iter(ints), k, chunk_size=3) == expected
+
+        middle = len(ints) // 2
+        left = ProductState(k).add_chunk(ints[:middle])
+        right = ProductState(k).add_chunk(ints[middle:])
+        assert left.merge(right).result() == expected
+
+    # No int64 overflow: the product is computed with Python ints
+    if np is not None:
+        big = np.array([2 ** 40, 2 ** 40, -3, 2 ** 40], dtype=np.int64)
+        assert highest_product_of_k(big) == 2 ** 120
+
+    print('All highest product tests passed!')
+    benchmark()
@@ -0,0 +1,211 @@
+# ===================================================================
+# PROBLEM: Cafe Order Checker - Streaming, N Registers
+# ===================================================================
+#
+# Companion code for cafe_order_checker.md.
+#
+# The write-up evolves is_first_come_first_served() from recursive
+# slicing (O(n²)) to iterative indices (O(n) time, O(1) space). All of
+# those versions still take LISTS, so the whole afternoon of orders has
+# to fit in memory first. When we audit kitchens from live order feeds
+# that never fit in memory, we need something that:
+#
+# 1. Takes iterators / generators, not lists
+# 2. Reads every stream exactly ONCE (no len(), no indexing, no rewind)
+# 3. Stops at the FIRST violation and says where it happened
+# 4. Handles any number of registers, not just take-out and dine-in
+#
+# HOW IT WORKS:
+# We only ever need the NEXT order from each register (its "head").
+# Each served order must equal one of the heads; when it does, we pull
+# the next order from that register and carry on. Memory is one head
+# per register: O(N) for N registers, O(1) for the classic two.
+#
+# Heads live in two structures:
+# - a dict {order_id: [register, ...]} for "does this match ANY head?"
+# - a heap keyed by order_id for strict=True, where order ids are
+#   issued in increasing order (ticket numbers, timestamps) and the
+#   kitchen must always serve the SMALLEST waiting id across registers.
+#
+# RESULT:
+# check_order_streams() returns an OrderCheck(is_valid, position,
+# order, message) - the answer to Bonus 2 ("better error reporting").
+# position is the 0-based index in served_orders where things went
+# wrong (or the number of orders served, for leftover orders).
+#
+# ===================================================================
+
+import heapq
+import sys
+import time
+from collections import namedtuple
+
+OrderCheck = namedtuple('OrderCheck', ['is_valid', 'position', 'order', 'message'])
+
+_EXHAUSTED = object()
+
+
+def is_first_come_first_served_v1(take_out_orders, dine_in_orders, served_orders):
+    """Recursive-with-slicing version from the write-up (O(n²))."""
+    if len(served_orders) == 0:
+        return True
+
+    if (len(take_out_orders) and
+            take_out_orders[0] == served_orders[0]):
+        return is_first_come_first_served_v1(
+            take_out_orders[1:],
+            dine_in_orders,
+            served_orders[1:]
+        )
+    elif (len(dine_in_orders) and
+          dine_in_orders[0] == served_orders[0]):
+        return is_first_come_first_served_v1(
+            take_out_orders,
+            dine_in_orders[1:],
+            served_orders[1:]
+        )
+    else:
+        return False
+
+
+def is_first_come_first_served(take_out_orders, dine_in_orders, served_orders):
+    """Iterative two-register version from the write-up (lists only)."""
+    take_out_orders_index = 0
+    dine_in_orders_index = 0
+
+    for order in served_orders:
+        if (take_out_orders_index < len(take_out_orders) and
+                order == take_out_orders[take_out_orders_index]):
+            take_out_orders_index += 1
+        elif (dine_in_orders_index < len(dine_in_orders) and
+              order == dine_in_orders[dine_in_orders_index]):
+            dine_in_orders_index += 1
+        else:
+            return False
+
+    if (take_out_orders_index != len(take_out_orders) or
+            dine_in_orders_index != len(dine_in_orders)):
+        return False
+
+    return True
+
+
+def check_order_streams(served_orders, *registers, strict=False):
+    """Check any number of register streams against one served stream.
+
+    Every argument may be any iterable (list, generator, file reader...).
+    Each is consumed at most once and never buffered.
+    """
+    streams = [iter(register) for register in registers]
+    heads = {}
+    heap = []
+
+    def advance(register):
+        order = next(streams[register], _EXHAUSTED)
+        if order is _EXHAUSTED:
+            return
+        heads.setdefault(order, []).append(register)
+        if strict:
+            heapq.heappush(heap, (order, register))
+
+    for register in range(len(streams)):
+        advance(register)
+
+    position = 0
+    for order in served_orders:
+        waiting = heads.get(order)
+        if not waiting:
+            return OrderCheck(False, position, order,
+                              f'order {order!r} is not next in any register')
+
+        if strict and heap[0][0] != order:
+            return OrderCheck(False, position, order,
+                              f'order {order!r} served before order {heap[0][0]!r}')
+
+        if strict:
+            _, register = heapq.heappop(heap)
+            waiting.remove(register)
+        else:
+            register = waiting.pop(0)
+        if not waiting:
+            del heads[order]
+        advance(register)
+        position += 1
+
+    if heads:
+        leftover = min(heads) if strict else next(iter(heads))
+        return OrderCheck(False, position, leftover,
+                          f'order {leftover!r} was never served')
+
+    return OrderCheck(True, position, None, 'first-come, first-served')
+
+
+def is_first_come_first_served_streaming(take_out_orders, dine_in_orders, served_orders):
+    """Drop-in replacement for is_first_come_first_served() over iterators."""
+    return check_order_streams(served_orders, take_out_orders, dine_in_orders).is_valid
+
+
+def benchmark(sizes=(250, 500, 1000, 2000, 4000)):
+    """Show the O(n²) slicing blowup next to the O(n) streaming checker."""
+    old_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(old_limit, 2 * max(sizes) + 100))
+    try:
+        print(f'{"orders":>8} {"v1 slicing (s)":>16} {"streaming (s)":>16} {"ratio":>8}')
+        for n in sizes:
+            take_out = list(range(0, n, 2))
+            dine_in = list(range(1, n, 2))
+            served = list(range(n))
+
+            begin = time.perf_counter()
+            assert is_first_come_first_served_v1(take_out, dine_in, served)
+            slicing = time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            assert check_order_streams(iter(served), iter(take_out), iter(dine_in)).is_valid
+            streaming = time.perf_counter() - begin
+
+            print(f'{n:>8} {slicing:>16.5f} {streaming:>16.5f} {slicing / streaming:>8.1f}')
+    finally:
+        sys.setrecursionlimit(old_limit)
+
+
+if __name__ == '__main__':
+    def generate(values):
+        # A generator can't be rewound or measured, like a live feed
+        yield from values
+
+    cases = [
+        ([1, 3, 5], [2, 4, 6], [1, 2, 4, 6, 5, 3], False),
+        ([17, 8, 24], [12, 19, 2], [17, 8, 12, 19, 24, 2], True),
+        ([], [], [], True),
+        ([1, 2, 3], [], [1, 2, 3], True),
+        ([], [1, 2, 3], [1, 2, 3], True),
+        ([1, 2, 3], [4], [1, 2, 3], False),
+        ([1, 2], [], [1, 2, 3], False),
+        ([1], [2], [1, 2], True),
+        ([1], [2], [2, 1], True),
+        ([1, 2, 3, 4], [5], [1, 5, 2, 3, 4], True),
+    ]
+    for take_out, dine_in, served, expected in cases:
+        assert is_first_come_first_served(take_out, dine_in, served) == expected
+        assert is_first_come_first_served_streaming(
+            generate(take_out), generate(dine_in), generate(served)) == expected
+
+    result = check_order_streams([1, 2, 4, 6, 5, 3], [1, 3, 5], [2, 4, 6])
+    assert result == (False, 4, 5, 'order 5 is not next in any register')
+    result = check_order_streams([1, 2, 3], [1, 2, 3], [4])
+    assert result.position == 3 and result.order == 4
+
+    # Three registers, and strict mode with increasing ticket numbers
+    assert check_order_streams([1, 2, 3, 4, 5, 6], [1, 4], [2, 5], [3, 6]).is_valid
+    assert check_order_streams([2, 1], [1], [2]).is_valid
+    assert check_order_streams([2, 1], [1], [2], strict=True).position == 0
+    assert check_order_streams([1, 2, 3], [1, 3], [2], strict=True).is_valid
+
+    # Stops at the first violation without reading the rest of the feed
+    served = generate([1, 99, 2, 3])
+    assert check_order_streams(served, [1, 2, 3]).position == 1
+    assert next(served) == 2
+
+    print('All cafe order checker tests passed!')
+    benchmark()
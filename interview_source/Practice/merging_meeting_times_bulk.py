@@ -0,0 +1,326 @@
+# ===================================================================
+# PROBLEM: Merging Meeting Times - Bulk / Bucketed Mode
+# ===================================================================
+#
+# Companion code for merging_meeting_times.md (see Bonus 1: "What if
+# we did have an upper bound on the input values?").
+#
+# HiCal meetings are integer counts of 30-minute blocks past 9:00 am,
+# so the values live in a small, bounded range. When we merge millions
+# of calendars per night, the O(n log n) comparison sort in
+# merge_ranges() is the bottleneck. This file adds:
+#
+# 1. merge_ranges_counting() - a counting / difference-array sweep for
+#    ONE calendar. O(n + U) time where U is the upper bound.
+# 2. pack_calendars() / unpack_calendars() - a flat "ragged" layout:
+#    every calendar's starts and ends are stored back-to-back in two
+#    flat arrays, and offsets[i]:offsets[i + 1] marks calendar i.
+# 3. merge_calendars_counting() - the difference-array sweep applied to
+#    MANY calendars in one call (vectorized with NumPy when available).
+# 4. merge_calendars_sorted() - a NumPy sort + cumulative-max pass for
+#    when there is no useful upper bound (e.g. Unix timestamps).
+# 5. benchmark() - reports calendars/sec for every engine.
+#
+# NumPy is optional. Without it, the batch functions fall back to the
+# pure-Python counting sweep one calendar at a time.
+#
+# ===================================================================
+# THE DOUBLED-COORDINATE TRICK
+# ===================================================================
+#
+# A naive difference array marks blocks start..end-1 as "busy". That
+# gets adjacency right ((1, 2) and (2, 3) touch, so they merge) but
+# loses zero-length meetings like (4, 4).
+#
+# Instead we double every coordinate and treat a meeting as the CLOSED
+# interval [2 * start, 2 * end]:
+#
+#   (1, 2), (2, 3)  ->  [2, 4], [4, 6]   share point 4   -> merge
+#   (1, 2), (3, 4)  ->  [2, 4], [6, 8]   point 5 is free -> separate
+#   (4, 4)          ->  [8, 8]           one busy point  -> kept
+#
+# Two meetings overlap in doubled space exactly when the reference
+# solution's check (current_start <= last_end) is True, so the output
+# is identical to merge_ranges() for every input.
+#
+# ===================================================================
+
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def merge_ranges(meetings):
+    """Reference solution from merging_meeting_times.md (O(n log n))."""
+    sorted_meetings = sorted(meetings)
+    merged_meetings = [sorted_meetings[0]]
+
+    for current_meeting_start, current_meeting_end in sorted_meetings[1:]:
+        last_merged_meeting_start, last_merged_meeting_end = merged_meetings[-1]
+
+        if current_meeting_start <= last_merged_meeting_end:
+            merged_meetings[-1] = (last_merged_meeting_start,
+                                   max(last_merged_meeting_end,
+                                       current_meeting_end))
+        else:
+            merged_meetings.append((current_meeting_start, current_meeting_end))
+
+    return merged_meetings
+
+
+def merge_ranges_counting(meetings, upper_bound=None):
+    """Merge one calendar with a difference-array sweep in O(n + U)."""
+    if not meetings:
+        return []
+    if upper_bound is None:
+        upper_bound = max(end for _, end in meetings)
+
+    # diff[p] is +1 where a doubled interval opens, -1 just past its end
+    diff = [0] * (2 * upper_bound + 2)
+    for start, end in meetings:
+        if start < 0 or end > upper_bound or start > end:
+            raise ValueError(f'meeting {(start, end)} is outside 0..{upper_bound}')
+        diff[2 * start] += 1
+        diff[2 * end + 1] -= 1
+
+    merged_meetings = []
+    busy = 0
+    run_start = 0
+    for point, delta in enumerate(diff):
+        if delta == 0:
+            continue
+        was_busy = busy > 0
+        busy += delta
+        if not was_busy and busy > 0:
+            run_start = point
+        elif was_busy and busy == 0:
+            # The run covered run_start..point-1, which always starts on an
+            # even point and ends on an even point in doubled space
+            merged_meetings.append((run_start // 2, (point - 1) // 2))
+
+    return merged_meetings
+
+
+def pack_calendars(calendars):
+    """Flatten a list of calendars into (starts, ends, offsets)."""
+    offsets = [0]
+    starts = []
+    ends = []
+    for meetings in calendars:
+        for start, end in meetings:
+            starts.append(start)
+            ends.append(end)
+        offsets.append(len(starts))
+
+    if np is not None:
+        return (np.asarray(starts, dtype=np.int64),
+                np.asarray(ends, dtype=np.int64),
+                np.asarray(offsets, dtype=np.int64))
+    return starts, ends, offsets
+
+
+def unpack_calendars(starts, ends, offsets):
+    """Inverse of pack_calendars(): rebuild a list of lists of tuples."""
+    if np is not None:
+        starts = np.asarray(starts).tolist()
+        ends = np.asarray(ends).tolist()
+        offsets = np.asarray(offsets).tolist()
+
+    calendars = []
+    for i in range(len(offsets) - 1):
+        lo, hi = offsets[i], offsets[i + 1]
+        calendars.append(list(zip(starts[lo:hi], ends[lo:hi])))
+    return calendars
+
+
+def _merge_calendars_counting_python(starts, ends, offsets, upper_bound):
+    merged_starts = []
+    merged_ends = []
+    merged_offsets = [0]
+    for i in range(len(offsets) - 1):
+        lo, hi = offsets[i], offsets[i + 1]
+        meetings = list(zip(starts[lo:hi], ends[lo:hi]))
+        for start, end in merge_ranges_counting(meetings, upper_bound):
+            merged_starts.append(start)
+            merged_ends.append(end)
+        merged_offsets.append(len(merged_starts))
+    return merged_starts, merged_ends, merged_offsets
+
+
+def _merge_chunk_counting_numpy(starts, ends, calendar_ids, num_calendars, upper_bound):
+    # Give every calendar its own slice of one long doubled timeline,
+    # so a single bincount + cumsum sweeps all of them at once
+    width = 2 * upper_bound + 2
+    base = calendar_ids * width
+    diff = np.bincount(base + 2 * starts, minlength=num_calendars * width)
+    diff -= np.bincount(base + 2 * ends + 1, minlength=num_calendars * width)
+    busy = np.cumsum(diff) > 0
+
+    # Busy runs never cross a calendar boundary: the last slot of every
+    # slice is the "just past 2 * upper_bound" point, which is never busy
+    edges = np.diff(busy.astype(np.int8), prepend=np.int8(0))
+    run_starts = np.flatnonzero(edges == 1)
+    run_stops = np.flatnonzero(edges == -1)
+
+    run_calendars = run_starts // width
+    merged_starts = (run_starts - run_calendars * width) // 2
+    merged_ends = (run_stops - 1 - run_calendars * width) // 2
+    counts = np.bincount(run_calendars, minlength=num_calendars)
+    return merged_starts, merged_ends, counts
+
+
+def merge_calendars_counting(starts, ends, offsets, upper_bound=None,
+                             chunk_calendars=65536):
+    """Merge every calendar in a ragged batch with a difference-array sweep.
+
+    Memory is bounded by processing chunk_calendars calendars at a time,
+    each needing 2 * upper_bound + 2 counters.
+    """
+    if upper_bound is None:
+        upper_bound = max(ends) if len(ends) else 0
+        upper_bound = int(upper_bound)
+
+    if np is None:
+        return _merge_calendars_counting_python(starts, ends, offsets, upper_bound)
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if len(starts) and (starts.min() < 0 or ends.max() > upper_bound
+                        or np.any(starts > ends)):
+        raise ValueError(f'meetings must satisfy 0 <= start <= end <= {upper_bound}')
+
+    num_calendars = len(offsets) - 1
+    sizes = np.diff(offsets)
+    out_starts = []
+    out_ends = []
+    out_counts = []
+    for first in range(0, num_calendars, chunk_calendars):
+        last = min(first + chunk_calendars, num_calendars)
+        lo, hi = offsets[first], offsets[last]
+        calendar_ids = np.repeat(np.arange(last - first), sizes[first:last])
+        chunk = _merge_chunk_counting_numpy(starts[lo:hi], ends[lo:hi],
+                                            calendar_ids, last - first,
+                                            upper_bound)
+        out_starts.append(chunk[0])
+        out_ends.append(chunk[1])
+        out_counts.append(chunk[2])
+
+    counts = np.concatenate(out_counts) if out_counts else np.zeros(0, np.int64)
+    merged_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    if out_starts:
+        return np.concatenate(out_starts), np.concatenate(out_ends), merged_offsets
+    return np.zeros(0, np.int64), np.zeros(0, np.int64), merged_offsets
+
+
+def merge_calendars_sorted(starts, ends, offsets):
+    """Merge every calendar with one NumPy sort and a cumulative-max pass.
+
+    Works for unbounded values (e.g. Unix timestamps) where the counting
+    sweep would need too many counters. Requires NumPy.
+    """
+    if np is None:
+        raise ImportError('merge_calendars_sorted() requires NumPy')
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    num_calendars = len(offsets) - 1
+    if len(starts) == 0:
+        return starts, ends, np.zeros(num_calendars + 1, np.int64)
+
+    calendar_ids = np.repeat(np.arange(num_calendars), np.diff(offsets))
+    order = np.lexsort((starts, calendar_ids))
+
+    # Shift each calendar into its own band of values, so one global
+    # running max never leaks an end time from one calendar into the next
+    low = min(starts.min(), ends.min())
+    band = max(starts.max(), ends.max()) - low + 1
+    shift = calendar_ids[order] * band - low
+    sorted_starts = starts[order] + shift
+    running_end = np.maximum.accumulate(ends[order] + shift)
+
+    # Same test as merge_ranges(): a meeting opens a new range when it
+    # starts after everything before it has ended
+    opens = np.empty(len(order), dtype=bool)
+    opens[0] = True
+    opens[1:] = sorted_starts[1:] > running_end[:-1]
+    first = np.flatnonzero(opens)
+    last = np.append(first[1:] - 1, len(order) - 1)
+
+    group_calendars = calendar_ids[order][first]
+    group_shift = group_calendars * band - low
+    counts = np.bincount(group_calendars, minlength=num_calendars)
+    merged_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return (sorted_starts[first] - group_shift,
+            running_end[last] - group_shift,
+            merged_offsets)
+
+
+def random_calendars(num_calendars, meetings_per_calendar, upper_bound, seed=0):
+    rng = random.Random(seed)
+    calendars = []
+    for _ in range(num_calendars):
+        meetings = []
+        for _ in range(meetings_per_calendar):
+            start = rng.randint(0, upper_bound)
+            meetings.append((start, rng.randint(start, upper_bound)))
+        calendars.append(meetings)
+    return calendars
+
+
+def benchmark(num_calendars=20000, meetings_per_calendar=8, upper_bound=16):
+    """Print calendars/sec for each engine on the same random batch."""
+    calendars = random_calendars(num_calendars, meetings_per_calendar, upper_bound)
+    starts, ends, offsets = pack_calendars(calendars)
+
+    engines = [
+        ('merge_ranges (sort, per calendar)',
+         lambda: [merge_ranges(meetings) for meetings in calendars]),
+        ('merge_ranges_counting (per calendar)',
+         lambda: [merge_ranges_counting(meetings, upper_bound) for meetings in calendars]),
+        ('merge_calendars_counting (batch)',
+         lambda: merge_calendars_counting(starts, ends, offsets, upper_bound)),
+    ]
+    if np is not None:
+        engines.append(('merge_calendars_sorted (batch)',
+                        lambda: merge_calendars_sorted(starts, ends, offsets)))
+
+    print(f'{num_calendars} calendars x {meetings_per_calendar} meetings, '
+          f'values 0..{upper_bound}')
+    for name, run in engines:
+        begin = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - begin
+        print(f'  {name:<40} {num_calendars / elapsed:>14,.0f} calendars/sec')
+
+
+if __name__ == '__main__':
+    cases = [
+        ([(0, 1), (3, 5), (4, 8), (10, 12), (9, 10)], [(0, 1), (3, 8), (9, 12)]),
+        ([(1, 2), (2, 3)], [(1, 3)]),
+        ([(1, 5), (2, 3)], [(1, 5)]),
+        ([(1, 10), (2, 6), (3, 5), (7, 9)], [(1, 10)]),
+        ([(1, 2), (3, 4), (5, 6)], [(1, 2), (3, 4), (5, 6)]),
+        ([(1, 5)], [(1, 5)]),
+        ([(5, 7), (1, 3), (4, 5)], [(1, 3), (4, 7)]),
+        ([(4, 4), (6, 6), (6, 7)], [(4, 4), (6, 7)]),
+    ]
+    for meetings, expected in cases:
+        assert merge_ranges(meetings) == expected
+        assert merge_ranges_counting(meetings) == expected
+
+    calendars = random_calendars(2000, 6, 20, seed=1) + [[]]
+    expected = [merge_ranges(meetings) if meetings else [] for meetings in calendars]
+    packed = pack_calendars(calendars)
+    assert unpack_calendars(*merge_calendars_counting(*packed, upper_bound=20,
+                                                      chunk_calendars=300)) == expected
+    if np is not None:
+        assert unpack_calendars(*merge_calendars_sorted(*packed)) == expected
+
+    print('All merge tests passed!')
+    benchmark()
@@ -0,0 +1,300 @@
+# ===================================================================
+# PROBLEM: Reverse String / Reverse Words - Zero-Copy Buffer Kernels
+# ===================================================================
+#
+# Companion code for reverse_string_in_place.md and reverse_words.md.
+#
+# The write-ups reverse a Python LIST of one-character strings. Every
+# character costs a list slot plus a pointer to a str object (50+
+# bytes per character), and every swap is a Python bytecode round
+# trip. For multi-GB messages we work on raw bytes instead:
+#
+# 1. reverse_in_place() - reverse a bytearray / memoryview / mmap (or
+#    a range of one) by swapping whole BLOCKS from both ends. Each
+#    block is flipped by a reversed slice in C, so the only extra
+#    memory is two blocks.
+# 2. reverse_words_in_place() - the same two-phase algorithm as
+#    reverse_words(): reverse the whole buffer, then reverse each
+#    word. Phase 2 runs a block of whole words at a time:
+#    - NumPy: locate separators with a vectorized search, then move
+#      every byte to its mirrored position inside its word with ONE
+#      gather (see below)
+#    - pure Python: split the block on the separator, flip every word
+#      with a reversed slice, and join it back - all in C
+# 3. reverse_file() / reverse_words_file() - run the kernels over an
+#    mmap of the file, so it is reversed in place on disk and only the
+#    blocks being touched are ever paged into memory.
+#
+# ===================================================================
+# PHASE 2 AS ONE GATHER
+# ===================================================================
+#
+# Inside a block, find every separator with one vectorized compare
+# (np.flatnonzero). That gives each word's [start, end). Reversing a
+# word moves the byte at start + end - 1 - i into position i:
+#
+#   block:   l a e t s _ d n u o p
+#   word:    [0, 5)      [6, 11)
+#   source:  4 3 2 1 0 5 10 9 8 7 6   ->   s t e a l _ p o u n d
+#
+# np.repeat spreads (start + end - 1) over each word's bytes, we
+# subtract the positions, and separators map to themselves. Then ONE
+# gather (block.take(source)) reverses every word in the block.
+#
+# A block always ends just after a separator, so no word is split. A
+# word longer than a whole block is reversed on its own with the
+# block-swap kernel.
+#
+# ===================================================================
+
+import mmap
+import os
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 1 << 20
+
+
+def reverse(list_of_chars):
+    """Reference two-pointer solution from reverse_string_in_place.md."""
+    left_index = 0
+    right_index = len(list_of_chars) - 1
+
+    while left_index < right_index:
+        list_of_chars[left_index], list_of_chars[right_index] = \
+            list_of_chars[right_index], list_of_chars[left_index]
+        left_index += 1
+        right_index -= 1
+
+
+def reverse_words(message):
+    """Reference two-phase solution from reverse_words.md."""
+    _reverse_characters(message, 0, len(message) - 1)
+
+    current_word_start_index = 0
+    for i in range(len(message) + 1):
+        if (i == len(message)) or (message[i] == ' '):
+            _reverse_characters(message, current_word_start_index, i - 1)
+            current_word_start_index = i + 1
+
+
+def _reverse_characters(message, left_index, right_index):
+    while left_index < right_index:
+        message[left_index], message[right_index] = \
+            message[right_index], message[left_index]
+        left_index += 1
+        right_index -= 1
+
+
+def _byte_view(buffer):
+    view = memoryview(buffer)
+    if view.readonly:
+        view.release()
+        raise TypeError('buffer must be writable (bytearray, mmap, ...)')
+    return view.cast('B')
+
+
+def _flipped(view, start, stop):
+    # A reversed copy of view[start:stop]; NumPy flips ~4x faster than bytes
+    if np is None:
+        return view[start:stop].tobytes()[::-1]
+    return np.frombuffer(view, dtype=np.uint8, count=stop - start, offset=start)[::-1].copy()
+
+
+def _reverse_range(view, start, stop, block_size):
+    # Swap blocks from both ends, flipping each one, until they meet
+    while stop - start > 2 * block_size:
+        left = _flipped(view, start, start + block_size)
+        view[start:start + block_size] = _flipped(view, stop - block_size, stop)
+        view[stop - block_size:stop] = left
+        start += block_size
+        stop -= block_size
+    if stop - start > 1:
+        view[start:stop] = _flipped(view, start, stop)
+
+
+def reverse_in_place(buffer, start=0, stop=None, block_size=BLOCK_SIZE):
+    """Reverse buffer[start:stop] in place, touching two blocks at a time."""
+    with _byte_view(buffer) as view:
+        stop = len(view) if stop is None else stop
+        _reverse_range(view, start, stop, block_size)
+
+
+def _find(view, separator, start, block_size):
+    # Index of the next separator at or after start, or len(view)
+    while start < len(view):
+        found = view[start:start + block_size].tobytes().find(separator)
+        if found >= 0:
+            return start + found
+        start += block_size
+    return len(view)
+
+
+def _reverse_each_word_numpy(view, start, stop, separator):
+    block = np.frombuffer(view, dtype=np.uint8, count=stop - start, offset=start)
+    size = len(block)
+    index = np.int32 if size < 2 ** 31 else np.int64
+
+    separators = np.flatnonzero(block == separator[0]).astype(index)
+    word_starts = np.concatenate(([0], separators + 1)).astype(index)
+    word_ends = np.append(separators, size).astype(index)
+    # Each word owns its bytes plus the separator after it
+    spans = np.diff(np.append(word_starts, size))
+
+    source = np.repeat(word_starts + word_ends - 1, spans)
+    source -= np.arange(size, dtype=index)
+    source[separators] = separators
+    block[:] = block.take(source)
+
+
+def _reverse_each_word_split(view, start, stop, separator):
+    words = view[start:stop].tobytes().split(separator)
+    view[start:stop] = separator.join([word[::-1] for word in words])
+
+
+def _reverse_each_word(view, separator, block_size):
+    reverse_block = _reverse_each_word_split if np is None else _reverse_each_word_numpy
+    size = len(view)
+    start = 0
+    while start < size:
+        stop = min(start + block_size, size)
+        if stop < size:
+            # Cut just after the last separator so no word is split
+            cut = view[start:stop].tobytes().rfind(separator)
+            if cut < 0:
+                # One word longer than a block: reverse it on its own
+                word_end = _find(view, separator, stop, block_size)
+                _reverse_range(view, start, word_end, block_size)
+                start = word_end + 1
+                continue
+            stop = start + cut + 1
+        reverse_block(view, start, stop, separator)
+        start = stop
+
+
+def reverse_words_in_place(buffer, separator=b' ', block_size=BLOCK_SIZE):
+    """Reverse the order of words in a writable buffer, in place."""
+    if len(separator) != 1:
+        raise ValueError('separator must be a single byte')
+    with _byte_view(buffer) as view:
+        _reverse_range(view, 0, len(view), block_size)
+        _reverse_each_word(view, separator, block_size)
+
+
+def _map_file(path, kernel):
+    with open(path, 'r+b') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0) as mapped:
+            kernel(mapped)
+            mapped.flush()
+
+
+def reverse_file(path, block_size=BLOCK_SIZE):
+    """Reverse every byte of a file in place on disk."""
+    _map_file(path, lambda mapped: reverse_in_place(mapped, block_size=block_size))
+
+
+def reverse_words_file(path, separator=b' ', block_size=BLOCK_SIZE):
+    """Reverse the order of words in a file in place on disk."""
+    _map_file(path, lambda mapped: reverse_words_in_place(mapped, separator, block_size))
+
+
+def benchmark(size=4_000_000):
+    """Compare the list-of-characters solution against the buffer kernels."""
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcdefghij') for _ in range(rng.randint(1, 12)))
+             for _ in range(5000)]
+    text = ' '.join(rng.choice(words) for _ in range(size // 7))[:size].strip()
+    print(f'{len(text) / 1e6:.1f} MB message')
+
+    message = list(text)
+    begin = time.perf_counter()
+    reverse_words(message)
+    elapsed = time.perf_counter() - begin
+    print(f'  list of characters   {len(text) / elapsed / 1e6:8.1f} MB/s')
+
+    buffer = bytearray(text.encode('ascii'))
+    begin = time.perf_counter()
+    reverse_words_in_place(buffer)
+    elapsed = time.perf_counter() - begin
+    print(f'  bytearray kernel     {len(text) / elapsed / 1e6:8.1f} MB/s '
+          f'({"numpy" if np is not None else "split/join"})')
+    assert buffer.decode('ascii') == ''.join(message)
+
+    begin = time.perf_counter()
+    reverse_in_place(buffer)
+    elapsed = time.perf_counter() - begin
+    print(f'  reverse_in_place     {len(text) / elapsed / 1e6:8.1f} MB/s')
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    cases = [
+        ('cake pound steal', 'steal pound cake'),
+        ('hello', 'hello'),
+        ('a', 'a'),
+        ('', ''),
+        ('aa bb', 'bb aa'),
+        ('a bbb', 'bbb a'),
+        ('find you will pain only go you recordings security the into if',
+         'if into the security recordings you go only pain will you find'),
+        ('  double  spaces ', ' spaces  double  '),
+    ]
+    for text, expected in cases:
+        message = list(text)
+        reverse_words(message)
+        assert ''.join(message) == expected
+
+        for block_size in (1, 2, 3, 5, BLOCK_SIZE):
+            buffer = bytearray(text.encode())
+            reverse_words_in_place(buffer, block_size=block_size)
+            assert buffer.decode() == expected, (text, block_size)
+
+            buffer = bytearray(text.encode())
+            reverse_in_place(buffer, block_size=block_size)
+            assert buffer.decode() == text[::-1]
+
+    # A range, and a memoryview over part of a larger buffer
+    buffer = bytearray(b'xxabcdefyy')
+    reverse_in_place(buffer, 2, 8, block_size=2)
+    assert buffer == bytearray(b'xxfedcbayy')
+    reverse_words_in_place(memoryview(buffer)[2:8])
+    assert buffer == bytearray(b'xxfedcbayy')
+
+    try:
+        reverse_in_place(b'read only')
+        assert False, 'Should raise error'
+    except TypeError:
+        pass
+
+    rng = random.Random(1)
+    for _ in range(200):
+        text = ''.join(rng.choice('ab  cde') for _ in range(rng.randint(0, 60)))
+        buffer = bytearray(text.encode())
+        reverse_words_in_place(buffer, block_size=rng.randint(1, 8))
+        assert buffer.decode() == ' '.join(text.split(' ')[::-1])
+
+    text = ' '.join(f'word{i}' for i in range(20000)) + ' ' + 'x' * 5000
+    with tempfile.NamedTemporaryFile(delete=False) as file:
+        file.write(text.encode())
+        path = file.name
+    try:
+        reverse_words_file(path, block_size=4096)
+        with open(path, 'rb') as file:
+            assert file.read().decode() == ' '.join(text.split(' ')[::-1])
+        reverse_file(path, block_size=4096)
+        reverse_file(path, block_size=4096)
+        with open(path, 'rb') as file:
+            assert file.read().decode() == ' '.join(text.split(' ')[::-1])
+    finally:
+        os.remove(path)
+
+    print('All reverse buffer tests passed!')
+    benchmark()